@@ -7,7 +7,7 @@ class PlotInterpolatedGraphs(Scene):
     def construct(self):
         # --- Load Data and Compute y Values ---
         # First dataset: cubic interpolation
-        delta_values1 = np.loadtxt("UpperBound.txt")  # expects 36 values for n = 1,2,...,36
+        delta_values1 = np.loadtxt("UpperBound.txt")[:36]  # n = 1,2,...,36 (the file goes up to 48)
         n_original1 = np.arange(1, len(delta_values1) + 1)
         y_original1 = np.log2(delta_values1) + n_original1 * (24 - n_original1) / 96
         # Prepend the point (0,0)
@@ -1,4 +1,7 @@
 from manim import *
+from domain_coloring import DomainColoring
+from modular_forms import j_invariant
+from modular_tessellation import ModularTessellation
 
 
 class UpperPlane(Scene):
@@ -39,17 +42,15 @@ class UpperPlane(Scene):
         )
         self.play(Write(re_label), Write(im_label), run_time=1.5)
 
-        # Create a rectangle representing the upper half-plane (Im(z) > 0)
-        upper_half_rect = Rectangle(
-            width=plane.get_width(),
-            height=plane.get_height() / 2,
-            fill_color=GREEN,
-            fill_opacity=0.5,
-            stroke_width=0
-        )
-        # Position the rectangle so its bottom edge aligns with the x-axis.
-        upper_half_rect.next_to(plane.get_x_axis(), UP, buff=0)
+        # Color the upper half-plane (Im(z) > 0) by the values of Klein's j-invariant.
+        upper_half = DomainColoring(plane, j_invariant).set_opacity(0.8)
+
+        # Fade it in behind the grid.
+        self.bring_to_back(upper_half)
+        self.play(FadeIn(upper_half))
+        self.wait(1)
 
-        # Animate the rectangle fading in.
-        self.play(FadeIn(upper_half_rect))
+        # Draw the tiling of the upper half-plane by images of the fundamental domain.
+        tessellation = ModularTessellation(plane, max_depth=20, stroke_width=1, stroke_opacity=0.8)
+        self.play(Create(tessellation), run_time=3)
         self.wait(2)
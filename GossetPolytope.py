@@ -0,0 +1,32 @@
+from manim import *
+import numpy as np
+from gosset_projection import GossetProjection, RotateProjection
+
+
+class GossetPolytope(Scene):
+    def construct(self):
+        # --------------------------
+        # The 240 roots of E8 in the Coxeter plane
+        # --------------------------
+        title = MathTex(r"E_8:\ 240\ \text{roots},\ 6720\ \text{edges}").to_edge(UP)
+        gosset = GossetProjection(scale=3.2).shift(DOWN * 0.3)
+
+        self.play(Write(title), run_time=1)
+        self.play(FadeIn(gosset.vertices), run_time=1)
+        self.wait(0.5)
+
+        # Fade the edges in ring by ring, from the center outwards.
+        self.play(LaggedStart(*[FadeIn(layer) for layer in gosset.edge_layers], lag_ratio=0.5), run_time=4)
+        self.wait(1)
+
+        # --------------------------
+        # Rotate to another projection and back
+        # --------------------------
+        other_plane = np.zeros((8, 2))
+        other_plane[:, 0] = [1, 1, 1, 1, 0, 0, 0, 0]
+        other_plane[:, 1] = [0, 0, 0, 0, 1, 1, 1, 1]
+        other_plane /= 2
+        self.play(RotateProjection(gosset, other_plane), run_time=4)
+        self.wait(1)
+        self.play(RotateProjection(gosset, gosset.coxeter_projection), run_time=4)
+        self.wait(2)
@@ -1,29 +1,27 @@
 from manim import *
 import numpy as np
-import math
+from instanced_shape import CreateInstances
+from lattice_engine import Lattice
+from streaming_lattice import StreamingLattice
 
 
-def closest_lattice_vector(long_vec):
+def closest_lattice_vector(long_vec, lattice=None):
     """
-    Given a long vector (assumed to have integer components),
-    returns one of the eight immediate lattice neighbors (excluding the origin)
-    whose angle (via arctan2) is closest to the angle of long_vec.
+    Given a long vector, returns one of the short lattice vectors around the origin
+    (for Z^2 the eight immediate neighbors, excluding the origin)
+    whose direction is closest to the direction of long_vec.
     (This function ignores the magnitude of long_vec.)
     """
-    angle = math.atan2(long_vec[1], long_vec[0])
-    candidates = [(1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1)]
-    best_candidate = None
-    best_diff = float('inf')
-    for cand in candidates:
-        cand_angle = math.atan2(cand[1], cand[0])
-        diff = abs((cand_angle - angle + math.pi) % (2 * math.pi) - math.pi)
-        if diff < best_diff:
-            best_diff = diff
-            best_candidate = cand
+    lattice = lattice or Lattice.square()
+    longest_basis = np.linalg.norm(lattice.reduced, axis=1).max()
+    candidates = lattice.short_vectors(longest_basis * np.sqrt(2))
+    direction = np.asarray(long_vec, dtype=float)[:2]
+    cosines = candidates @ direction / np.linalg.norm(candidates, axis=1)
+    best_candidate = candidates[np.argmax(cosines)]
     return np.array([best_candidate[0], best_candidate[1], 0])
 
 
-class ExtendedLatticeGridWithDots(Scene):
+class ExtendedLatticeGridWithDots(MovingCameraScene):
     def construct(self):
         # --- Step 1: Animate Grid and Dots Appearing ---
         plane = NumberPlane(
@@ -38,12 +36,10 @@ class ExtendedLatticeGridWithDots(Scene):
         grid_lines = VGroup(*plane.background_lines)
         self.play(LaggedStart(*[Create(line) for line in grid_lines], lag_ratio=0.05))
 
-        dots = VGroup()
-        for x in np.arange(-10, 11):
-            for y in np.arange(-6, 7):
-                dot = Dot(point=[x, y, 0], radius=0.08, color=BLUE)
-                dots.add(dot)
-        self.play(FadeIn(dots))
+        # Only the lattice points inside the camera frame are materialized,
+        # and they follow the camera if it pans or zooms.
+        lattice_view = StreamingLattice(Lattice.square(), self.camera.frame, dot_radius=0.08, dot_color=BLUE)
+        self.play(FadeIn(lattice_view))
         self.wait(1)
 
         # --- Step 2: Vector Addition Animation ---
@@ -118,11 +114,6 @@ class ExtendedLatticeGridWithDots(Scene):
         self.wait(0.5)
 
         # --- Step 6: Draw a Sphere Around Every Lattice Point ---
-        spheres = VGroup()
-        for x in np.arange(-10, 11):
-            for y in np.arange(-6, 7):
-                sphere = Circle(radius=0.5, color=GREEN, stroke_width=2)
-                sphere.move_to([x, y, 0])
-                spheres.add(sphere)
-        self.play(LaggedStart(*[Create(sphere) for sphere in spheres], lag_ratio=0.02))
+        spheres = lattice_view.show_spheres(0.5, color=GREEN, stroke_width=2)
+        self.play(CreateInstances(spheres, lag_ratio=0.02))
         self.wait(2)
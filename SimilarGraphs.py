@@ -1,5 +1,6 @@
 from manim import *
 import numpy as np
+from magic_function import magic_function, magic_transform
 
 
 class PiecewiseGraphs(Scene):
@@ -111,24 +112,10 @@ class PiecewiseGraphs(Scene):
             run_time=1.5
         )
 
-        # Define the piecewise function for the left graph: g(x)
-        def g(x):
-            if x <= np.sqrt(2):
-                return 1 - (x ** 2) / 2
-            else:
-                return - (np.sin(np.pi * (x ** 2 / 2 - 1)) ** 2) / (np.pi ** 2 * (x ** 2 / 2 - 1))
-
-        # Define the piecewise function for the right graph: ĝ(x)
-        # (For x >= √2, the minus sign is removed.)
-        def g_hat(x):
-            if x <= np.sqrt(2):
-                return 1 - (x ** 2) / 2
-            else:
-                return (np.sin(np.pi * (x ** 2 / 2 - 1)) ** 2) / (np.pi ** 2 * (x ** 2 / 2 - 1))
-
-        # Plot the graphs.
-        left_graph = left_axes.plot(g, x_range=[0, 2.7], color=RED)
-        right_graph = right_axes.plot(g_hat, x_range=[0, 2.7], color=BLUE)
+        # Plot Viazovska's magic function and its Fourier transform; both are
+        # evaluated for all sample radii at once.
+        left_graph = left_axes.plot(magic_function, x_range=[0, 2.7, 0.005], use_vectorized=True, color=RED)
+        right_graph = right_axes.plot(magic_transform, x_range=[0, 2.7, 0.005], use_vectorized=True, color=BLUE)
 
         # Create labels for the graphs.
         left_label = MathTex("g(x)").set_color(RED)
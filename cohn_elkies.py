@@ -0,0 +1,183 @@
+import os
+import sys
+from itertools import repeat
+import numpy as np
+from scipy.optimize import linprog, minimize_scalar
+from scipy.special import eval_genlaguerre
+from disk_cache import cache_key, cache_path, load_cached
+from process_pool import process_map
+
+# Bump when the solver changes in a way that changes its results.
+SOLVER_FORMAT = 2
+
+# HiGHS' default tolerances (1e-7) let sampled constraints slip by more than the
+# precision of the bounds.
+HIGHS_OPTIONS = {"primal_feasibility_tolerance": 1e-10, "dual_feasibility_tolerance": 1e-10}
+
+
+def laguerre_basis(dimension, degree, t):
+    """
+    Radial eigenfunctions of the Fourier transform in R^n, evaluated at radii t:
+    column k is L_k^(n/2 - 1)(2 pi t^2) exp(-pi t^2), with eigenvalue (-1)^k.
+    Columns are scaled to 1 at t = 0 to keep the linear program well conditioned.
+    """
+    alpha = dimension / 2 - 1
+    t = np.asarray(t, dtype=float)[:, None]
+    k = np.arange(degree)[None, :]
+    values = eval_genlaguerre(k, alpha, 2 * np.pi * t ** 2) * np.exp(-np.pi * t ** 2)
+    return values / eval_genlaguerre(k, alpha, 0.0)
+
+
+def default_degree(dimension):
+    """
+    Number of Laguerre terms used in dimension n: the optimal auxiliary functions
+    oscillate more as n grows, so the degree grows with it.
+    """
+    return 24 + dimension // 2
+
+
+def _peaks(values, grid):
+    """
+    Radii of the local maxima of values sampled on a uniform grid (including a maximum
+    at the first radius), each moved to the vertex of the parabola through its neighbors.
+    """
+    i = np.nonzero((values[1:-1] >= values[:-2]) & (values[1:-1] >= values[2:]))[0] + 1
+    left, middle, right = values[i - 1], values[i], values[i + 1]
+    curvature = left - 2 * middle + right
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shift = np.where(curvature < 0, (left - right) / (2 * curvature), 0.0)
+    peaks = grid[i] + np.clip(shift, -1, 1) * (grid[1] - grid[0])
+    return np.append(peaks, grid[0]) if values[0] > values[1] else peaks
+
+
+def _solve_lp(dimension, radius, degree, samples, max_rounds=30, tolerance=1e-9):
+    """
+    Smallest f(0) for a given radius, subject to fhat(0) = 1, fhat >= 0 everywhere and
+    f <= 0 beyond the radius. The sign conditions start out on `samples` radii each
+    and hold there with a margin of `tolerance`; every round locates the extrema of
+    the solution on a fine grid and adds those that break a sign condition by more
+    than `tolerance` (far below the 5 decimals the bounds are rounded up to).
+    Returns f(0), or inf if the program is infeasible or still breaks a sign condition
+    after max_rounds.
+    """
+    signs = (-1.0) ** np.arange(degree)
+    reach = np.sqrt((4 * degree + dimension + 10) / (2 * np.pi)) * 1.5
+    fhat_points = np.linspace(0, reach, samples)
+    f_points = np.linspace(radius, max(reach, radius + 1), samples)
+    fhat_grid = np.linspace(0, 2 * reach, 40 * samples)
+    f_grid = np.linspace(radius, 2 * max(reach, radius + 1), 40 * samples)
+    fine_fhat = laguerre_basis(dimension, degree, fhat_grid) * signs
+    fine_f = laguerre_basis(dimension, degree, f_grid)
+
+    for _ in range(max_rounds):
+        fhat_rows = laguerre_basis(dimension, degree, fhat_points) * signs
+        f_rows = laguerre_basis(dimension, degree, f_points)
+        rows = np.vstack([-fhat_rows, f_rows])
+        rows /= np.abs(rows).max(axis=1, keepdims=True)
+        result = linprog(np.ones(degree), A_ub=rows, b_ub=np.full(len(rows), -tolerance), A_eq=signs[None, :],
+                         b_eq=[1.0], bounds=[(None, None)] * degree, method="highs", options=HIGHS_OPTIONS)
+        if result.status != 0:
+            return np.inf
+
+        # Check the sign conditions at the extrema of the solution, not just on the grid.
+        fhat_peaks = _peaks(-(fine_fhat @ result.x), fhat_grid)
+        f_peaks = _peaks(fine_f @ result.x, f_grid)
+        fhat_bad = laguerre_basis(dimension, degree, fhat_peaks) * signs @ result.x < -tolerance
+        f_bad = laguerre_basis(dimension, degree, f_peaks) @ result.x > tolerance
+        if not fhat_bad.any() and not f_bad.any():
+            return result.fun
+        fhat_points = np.union1d(fhat_points, fhat_peaks[fhat_bad])
+        f_points = np.union1d(f_points, f_peaks[f_bad])
+    return np.inf
+
+
+def cohn_elkies_bound(dimension, degree=None, samples=400):
+    """
+    Cohn-Elkies upper bound on the center density of sphere packings in R^n.
+
+    For an auxiliary function f = p(|x|^2) exp(-pi |x|^2) with f(0) = fhat(0) scaled so
+    that fhat(0) = 1, fhat >= 0 and f(x) <= 0 for |x| >= r, the center density is at
+    most (r / 2)^n f(0). The polynomial is expanded in Laguerre eigenfunctions and
+    found by a linear program (HiGHS) for each r; r itself is optimized by a scalar
+    search. The degree defaults to default_degree(n). The sign conditions are only
+    checked numerically, so the result is a numerical bound rather than a certified one.
+
+    Returns (bound, radius); the bound is inf if no radius gives a valid function.
+    """
+    if degree is None:
+        degree = default_degree(dimension)
+
+    def log_bound(radius):
+        value = _solve_lp(dimension, radius, degree, samples)
+        return dimension * np.log(radius / 2) + np.log(value) if 0 < value < np.inf else np.inf
+
+    # A coarse scan finds the basin, a bounded scalar search refines the radius.
+    radii = np.linspace(0.5, 1.2 + np.sqrt(dimension) / 1.8, 24)
+    values = np.array([log_bound(radius) for radius in radii])
+    best = int(np.argmin(values))
+    lower, upper = radii[max(best - 1, 0)], radii[min(best + 1, len(radii) - 1)]
+    with np.errstate(invalid="ignore"):  # radii without a valid function score inf
+        result = minimize_scalar(log_bound, bounds=(lower, upper), method="bounded", options={"xatol": 1e-5})
+    radius = result.x if result.fun < values[best] else radii[best]
+    return float(np.exp(min(result.fun, values[best]))), float(radius)
+
+
+def cached_bound(dimension, degree=None, samples=400):
+    """
+    cohn_elkies_bound, cached on disk per dimension and solver settings.
+    """
+    if degree is None:
+        degree = default_degree(dimension)
+    path = cache_path("cohn_elkies", cache_key(SOLVER_FORMAT, dimension, degree, samples), ".npy")
+    return tuple(load_cached(path, lambda: np.array(cohn_elkies_bound(dimension, degree, samples))).tolist())
+
+
+def _round_up(value, digits=5):
+    """
+    value rounded up to `digits` decimals, so the rounded number is still an upper bound.
+    """
+    scale = 10 ** digits
+    return np.ceil(value * scale) / scale
+
+
+def compute_upper_bounds(max_dimension=48, degree=None, samples=400, processes=None):
+    """
+    Cohn-Elkies bounds for n = 1 .. max_dimension, solved in a process pool.
+    """
+    dimensions = list(range(1, max_dimension + 1))
+    results = process_map(cached_bound, dimensions, repeat(degree), repeat(samples), processes=processes)
+    return np.array([bound for bound, _ in results])
+
+
+def read_upper_bounds(path="UpperBound.txt"):
+    """
+    The bounds in a file written by write_upper_bounds (empty if there is none).
+    """
+    if not os.path.exists(path):
+        return np.zeros(0)
+    return np.loadtxt(path, ndmin=1)
+
+
+def write_upper_bounds(path="UpperBound.txt", max_dimension=48, **kwargs):
+    """
+    Update the file BoundsGraph reads: one center density bound per line, n = 1, 2, ...
+
+    An entry already in the file is only replaced by a smaller bound, so a weaker
+    computation never overwrites a better known value. Returns the bounds written.
+    """
+    known = read_upper_bounds(path)
+    bounds = _round_up(compute_upper_bounds(max_dimension, **kwargs))
+    shared = min(len(known), max_dimension)
+    bounds[:shared] = np.minimum(bounds[:shared], known[:shared])
+    if not np.all(np.isfinite(bounds)):
+        missing = np.nonzero(~np.isfinite(bounds))[0] + 1
+        raise ValueError(f"no valid Cohn-Elkies function found in dimensions {missing.tolist()}")
+    bounds = np.concatenate([bounds, known[max_dimension:]])
+    with open(path, "w") as file:
+        for bound in bounds:
+            file.write(f"{bound:.5f}\n")
+    return bounds
+
+
+if __name__ == "__main__":
+    write_upper_bounds(max_dimension=int(sys.argv[1]) if len(sys.argv) > 1 else 48)
@@ -0,0 +1,53 @@
+import hashlib
+import os
+import numpy as np
+
+# Cached results live next to manim's own output, relative to where the scene is rendered.
+CACHE_ROOT = os.path.join("media", "cache")
+
+
+def cache_key(*parts):
+    """
+    Stable hash of the parameters a cached result depends on. Arrays are hashed by
+    dtype, shape and contents; everything else by repr().
+    """
+    digest = hashlib.sha1()
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            part = np.ascontiguousarray(part)
+            digest.update(f"{part.dtype}{part.shape}".encode())
+            digest.update(part.tobytes())
+        else:
+            digest.update(repr(part).encode())
+        digest.update(b"|")
+    return digest.hexdigest()[:20]
+
+
+def cache_path(namespace, key, suffix=""):
+    """
+    Path of a cache entry, creating its namespace directory on first use.
+    """
+    directory = os.path.join(CACHE_ROOT, namespace)
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, key + suffix)
+
+
+def save_atomic(path, array):
+    """
+    np.save an array to a .npy path through a scratch file and a rename, so that other
+    processes never see a partly written entry.
+    """
+    scratch = f"{path}.tmp{os.getpid()}.npy"
+    np.save(scratch, array)
+    os.replace(scratch, path)
+
+
+def load_cached(path, build):
+    """
+    The array saved at path, or build()'s result, saved there first.
+    """
+    if os.path.exists(path):
+        return np.load(path)
+    array = build()
+    save_atomic(path, array)
+    return array
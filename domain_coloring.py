@@ -0,0 +1,156 @@
+import os
+import sys
+import time
+from itertools import repeat
+import numpy as np
+from manim import *
+from disk_cache import cache_key, cache_path, save_atomic
+from modular_forms import j_invariant
+from process_pool import process_map
+
+# Bump when the coloring or the layout of the cached tiles changes.
+TILE_FORMAT = 1
+
+
+def domain_colors(values):
+    """
+    Domain coloring of an array of complex values as float RGB in [0, 1]: the hue is
+    the argument, and the brightness rises from 0.6 to 1 between consecutive powers of
+    two of the modulus, so level sets of |w| show up as bands. Non-finite values
+    (poles) are white.
+    """
+    values = np.asarray(values, dtype=complex)
+    finite = np.isfinite(values)
+    hue = (np.angle(np.where(finite, values, 1)) / (2 * np.pi)) % 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bands = np.log2(np.abs(values))
+        brightness = np.where(finite, 0.6 + 0.4 * (bands - np.floor(bands)), 1.0)
+    brightness = np.nan_to_num(brightness, nan=0.6, posinf=1.0, neginf=0.6)
+    # HSV to RGB with full saturation, for all pixels at once.
+    channels = [(n + 6 * hue) % 6 for n in (5, 3, 1)]
+    rgb = np.stack([brightness * (1 - np.clip(np.minimum(k, 4 - k), 0, 1)) for k in channels], axis=-1)
+    rgb[~finite] = 1.0
+    return rgb
+
+
+def _render_tile(function, x_bounds, y_bounds, shape, upper_half_plane):
+    """
+    RGBA uint8 pixels of one tile: pixel centers cover [x0, x1] x [y0, y1] with the
+    first row at the top. Points outside the upper half-plane stay transparent when
+    upper_half_plane is set.
+    """
+    height, width = shape
+    x = x_bounds[0] + (np.arange(width) + 0.5) * (x_bounds[1] - x_bounds[0]) / width
+    y = y_bounds[1] - (np.arange(height) + 0.5) * (y_bounds[1] - y_bounds[0]) / height
+    z = x[None, :] + 1j * y[:, None]
+    inside = z.imag > 0 if upper_half_plane else np.ones(shape, dtype=bool)
+    pixels = np.zeros(shape + (4,), dtype=np.uint8)
+    if inside.any():
+        with np.errstate(all="ignore"):
+            values = function(z[inside])
+        pixels[inside, :3] = np.round(domain_colors(values) * 255)
+        pixels[inside, 3] = 255
+    return pixels
+
+
+def _function_name(function):
+    return f"{function.__module__}.{function.__qualname__}"
+
+
+def render_domain_coloring(function, x_range, y_range, width, height, tile_size=256,
+                           upper_half_plane=True, processes=None, use_cache=True):
+    """
+    Domain coloring of `function` over [x_range] x [y_range] as a (height, width, 4)
+    uint8 image.
+
+    The image is split into tile_size tiles that are evaluated in a process pool (so
+    `function` has to be a module-level function taking an array of complex numbers)
+    and cached on disk by the function's qualified name, the viewport, the resolution
+    and the tile, so re-rendering the same view only loads files.
+    """
+    x_range = (float(x_range[0]), float(x_range[1]))
+    y_range = (float(y_range[0]), float(y_range[1]))
+    dx = (x_range[1] - x_range[0]) / width
+    dy = (y_range[1] - y_range[0]) / height
+    tiles = [(row, col) for row in range(0, height, tile_size) for col in range(0, width, tile_size)]
+    image = np.zeros((height, width, 4), dtype=np.uint8)
+
+    missing, paths = [], {}
+    for row, col in tiles:
+        key = cache_key(TILE_FORMAT, _function_name(function), x_range, y_range, width, height,
+                        tile_size, row, col, upper_half_plane)
+        paths[row, col] = cache_path("domain_coloring", key, ".npy")
+        if use_cache and os.path.exists(paths[row, col]):
+            tile = np.load(paths[row, col])
+            image[row:row + tile.shape[0], col:col + tile.shape[1]] = tile
+        else:
+            missing.append((row, col))
+    if not missing:
+        return image
+
+    shapes = [(min(tile_size, height - row), min(tile_size, width - col)) for row, col in missing]
+    x_bounds = [(x_range[0] + col * dx, x_range[0] + (col + shape[1]) * dx) for (row, col), shape in zip(missing, shapes)]
+    y_bounds = [(y_range[1] - (row + shape[0]) * dy, y_range[1] - row * dy) for (row, col), shape in zip(missing, shapes)]
+    rendered = process_map(_render_tile, repeat(function), x_bounds, y_bounds, shapes, repeat(upper_half_plane),
+                           processes=processes)
+
+    for (row, col), tile in zip(missing, rendered):
+        image[row:row + tile.shape[0], col:col + tile.shape[1]] = tile
+        if use_cache:
+            save_atomic(paths[row, col], tile)
+    return image
+
+
+class DomainColoring(ImageMobject):
+    """
+    Domain coloring of a function over the visible region of a ComplexPlane, as one
+    image lined up with the plane's coordinates. The resolution defaults to the
+    render resolution, so every pixel of the plane gets its own function value.
+    """
+
+    def __init__(self, plane, function, pixel_width=None, upper_half_plane=True, tile_size=256,
+                 processes=None, **kwargs):
+        x_range, y_range = plane.x_range[:2], plane.y_range[:2]
+        lower_left = plane.c2p(x_range[0], y_range[0])
+        upper_right = plane.c2p(x_range[1], y_range[1])
+        size = upper_right - lower_left
+        if pixel_width is None:
+            pixel_width = int(round(size[0] * config["pixel_width"] / config["frame_width"]))
+        pixel_height = max(int(round(pixel_width * size[1] / size[0])), 1)
+        self.function = function
+        image = render_domain_coloring(function, x_range, y_range, pixel_width, pixel_height, tile_size,
+                                       upper_half_plane, processes)
+        super().__init__(image, scale_to_resolution=config["pixel_height"], **kwargs)
+        self.base_alpha = self.pixel_array[:, :, 3].copy()
+        self.stretch_to_fit_width(size[0])
+        self.stretch_to_fit_height(size[1])
+        self.move_to((lower_left + upper_right) / 2)
+
+    def set_opacity(self, alpha):
+        """
+        Scale the rendered alpha channel by alpha, so that pixels left transparent
+        (outside the upper half-plane) stay transparent.
+        """
+        self.pixel_array[:, :, 3] = np.round(self.base_alpha * alpha).astype(np.uint8)
+        self.fill_opacity = alpha
+        self.stroke_opacity = alpha
+        return self
+
+
+def benchmark(width=3840, height=2160, processes=None):
+    """
+    Time a 4K render of Klein's j over the default ComplexPlane view, uncached and
+    then from the tile cache.
+    """
+    view = ((-7.111, 7.111), (-4, 4))
+    start = time.perf_counter()
+    render_domain_coloring(j_invariant, *view, width, height, processes=processes, use_cache=False)
+    print(f"{width}x{height} uncached in {time.perf_counter() - start:.2f} s")
+    render_domain_coloring(j_invariant, *view, width, height, processes=processes)
+    start = time.perf_counter()
+    render_domain_coloring(j_invariant, *view, width, height, processes=processes)
+    print(f"{width}x{height} from cache in {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    benchmark(processes=int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -0,0 +1,170 @@
+import time
+import numpy as np
+from disk_cache import cache_key, cache_path, load_cached
+from modular_forms import divisor_sums
+
+DIMENSION = 8
+
+# Bump when the layout of the cached shells changes.
+SHELL_FORMAT = 1
+
+
+def closest_dn(x):
+    """
+    Closest point of D_n (integer vectors with an even coordinate sum) to every row of
+    an (..., n) array, by Conway and Sloane's rounding: round every coordinate, and if
+    the sum comes out odd, round the coordinate with the largest rounding error the
+    other way.
+    """
+    x = np.asarray(x, dtype=float)
+    flat = x.reshape(-1, x.shape[-1])
+    rounded = np.rint(flat)
+    error = flat - rounded
+    odd = np.nonzero(rounded.sum(axis=1) % 2)[0]
+    worst = np.abs(error[odd]).argmax(axis=1)
+    rounded[odd, worst] += np.where(error[odd, worst] >= 0, 1.0, -1.0)
+    return rounded.reshape(x.shape)
+
+
+def closest_e8(x):
+    """
+    Closest E8 point to every row of an (..., 8) array.
+
+    E8 is D8 together with the coset D8 + (1/2, ..., 1/2), so the decoder rounds to
+    both and keeps the nearer candidate.
+    """
+    x = np.asarray(x, dtype=float)
+    if x.shape[-1] != DIMENSION:
+        raise ValueError("E8 points need 8 coordinates")
+    integer = closest_dn(x)
+    half = closest_dn(x - 0.5) + 0.5
+    integer_closer = ((x - integer) ** 2).sum(axis=-1) <= ((x - half) ** 2).sum(axis=-1)
+    return np.where(integer_closer[..., None], integer, half)
+
+
+def e8_properties(x, atol=1e-9):
+    """
+    The properties from E8Properties, checked for every row of an (..., 8) array.
+
+    Returns boolean arrays: "coordinates" (all in Z or all in Z + 1/2), "even_sum"
+    (the coordinate sum is an even integer), "member" (both), and "norm" (members
+    are zero or have length at least sqrt(2)).
+    """
+    x = np.asarray(x, dtype=float)
+    doubled = 2 * x
+    half_integral = np.all(np.abs(doubled - np.round(doubled)) <= 2 * atol, axis=-1)
+    parity = np.round(doubled) % 2
+    same_kind = np.all(parity == parity[..., :1], axis=-1)
+    coordinates = half_integral & same_kind
+    total = x.sum(axis=-1)
+    even_sum = (np.abs(total - np.round(total)) <= DIMENSION * atol) & (np.round(total) % 2 == 0)
+    member = coordinates & even_sum
+    norm2 = (x ** 2).sum(axis=-1)
+    norm = ~member | (norm2 <= atol) | (norm2 >= 2 - atol)
+    return {"coordinates": coordinates, "even_sum": even_sum, "member": member, "norm": norm}
+
+
+def in_e8(x, atol=1e-9):
+    """
+    Whether every row of an (..., 8) array is an E8 point.
+    """
+    return e8_properties(x, atol)["member"]
+
+
+def theta_coefficient(m):
+    """
+    Number of E8 vectors of squared norm 2m: the q^m coefficient 240 sigma_3(m) of
+    the E8 theta series (1 for m = 0).
+    """
+    return 1 if m == 0 else int(240 * divisor_sums(3, m + 1)[m])
+
+
+def _half_coordinate_vectors(target, odd):
+    """
+    All integer vectors h of length 8 with sum(h^2) == target whose coordinates are
+    all odd (odd=True) or all even, built one coordinate at a time and pruned by the
+    norm the remaining coordinates need at least.
+    """
+    limit = int(np.sqrt(target))
+    values = np.arange(-limit, limit + 1)
+    values = values[values % 2 == (1 if odd else 0)]
+    least = 1 if odd else 0
+    partial = np.zeros((1, 0), dtype=np.int64)
+    norms = np.zeros(1, dtype=np.int64)
+    for position in range(DIMENSION):
+        remaining = DIMENSION - position - 1
+        new_norms = norms[:, None] + values[None, :] ** 2
+        keep = new_norms + remaining * least <= target
+        rows, columns = np.nonzero(keep)
+        partial = np.column_stack([partial[rows], values[columns]])
+        norms = new_norms[rows, columns]
+    return partial[norms == target]
+
+
+def _enumerate_shell(m):
+    """
+    E8 vectors of squared norm 2m as int8 half-coordinates (2x), in lexicographic order.
+    """
+    target = 8 * m
+    even = _half_coordinate_vectors(target, odd=False)
+    odd = _half_coordinate_vectors(target, odd=True)
+    # x = h / 2 needs an even coordinate sum, i.e. sum(h) divisible by 4.
+    shell = np.vstack([even[even.sum(axis=1) % 4 == 0], odd[odd.sum(axis=1) % 4 == 0]])
+    shell = shell[np.lexsort(shell.T[::-1])].astype(np.int8)
+    if len(shell) != theta_coefficient(m):
+        raise RuntimeError(f"E8 shell {m} has {len(shell)} vectors, expected {theta_coefficient(m)}")
+    return shell
+
+
+def e8_shell(m, use_cache=True):
+    """
+    E8 vectors of squared norm 2m as an (N, 8) int8 array of half-coordinates
+    (divide by 2 for the vectors). Shells are cached on disk after the first call.
+    """
+    if not use_cache:
+        return _enumerate_shell(m)
+    return load_cached(cache_path("e8_shells", cache_key(SHELL_FORMAT, m), ".npy"), lambda: _enumerate_shell(m))
+
+
+def e8_shell_vectors(m, use_cache=True):
+    """
+    E8 vectors of squared norm 2m as floats.
+    """
+    return e8_shell(m, use_cache) / 2
+
+
+def theta_series(num_terms, use_cache=True):
+    """
+    Shell sizes for m = 0 .. num_terms - 1, counted from the enumerated shells
+    (each of which is checked against 240 sigma_3(m)).
+    """
+    return np.array([1] + [len(e8_shell(m, use_cache)) for m in range(1, num_terms)])
+
+
+def minimal_norm(use_cache=True):
+    """
+    Length of the shortest nonzero E8 vector. E8 norms are even integers, so this is
+    the length of the first nonempty shell: sqrt(2), carried by the 240 roots.
+    """
+    m = 1
+    while not len(e8_shell(m, use_cache)):
+        m += 1
+    return np.sqrt(2 * m)
+
+
+def benchmark(num_samples=1_000_000, seed=0):
+    """
+    Decode random samples, print the throughput and check that every result is an
+    E8 point.
+    """
+    rng = np.random.default_rng(seed)
+    samples = rng.uniform(-4, 4, size=(num_samples, DIMENSION))
+    start = time.perf_counter()
+    decoded = closest_e8(samples)
+    elapsed = time.perf_counter() - start
+    print(f"{num_samples} samples in {elapsed:.3f} s ({num_samples / elapsed / 1e6:.2f} M points/s)")
+    print(f"all decoded points in E8: {bool(in_e8(decoded).all())}")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,126 @@
+from manim import *
+import numpy as np
+from e8 import e8_shell_vectors
+from instanced_shape import InstancedShape
+
+# Simple roots of E8 in the coordinates of E8Properties (Bourbaki's numbering).
+E8_SIMPLE_ROOTS = np.array([
+    [0.5, -0.5, -0.5, -0.5, -0.5, -0.5, -0.5, 0.5],
+    [1, 1, 0, 0, 0, 0, 0, 0],
+    [-1, 1, 0, 0, 0, 0, 0, 0],
+    [0, -1, 1, 0, 0, 0, 0, 0],
+    [0, 0, -1, 1, 0, 0, 0, 0],
+    [0, 0, 0, -1, 1, 0, 0, 0],
+    [0, 0, 0, 0, -1, 1, 0, 0],
+    [0, 0, 0, 0, 0, -1, 1, 0],
+])
+
+E8_COXETER_NUMBER = 30
+
+
+def coxeter_plane(simple_roots=E8_SIMPLE_ROOTS, coxeter_number=E8_COXETER_NUMBER):
+    """
+    Orthonormal (d, 2) basis of the Coxeter plane: the plane on which a Coxeter element
+    (the product of all simple reflections) acts as a rotation by 2 pi / h.
+    """
+    dimension = simple_roots.shape[1]
+    coxeter_element = np.eye(dimension)
+    for root in simple_roots:
+        reflection = np.eye(dimension) - 2 * np.outer(root, root) / (root @ root)
+        coxeter_element = coxeter_element @ reflection
+    eigenvalues, eigenvectors = np.linalg.eig(coxeter_element)
+    best = np.argmin(np.abs(eigenvalues - np.exp(2j * np.pi / coxeter_number)))
+    plane = np.column_stack([eigenvectors[:, best].real, eigenvectors[:, best].imag])
+    return np.linalg.qr(plane)[0]
+
+
+def interpolate_projection(start, end, alpha):
+    """
+    Orthonormal projection basis between two (d, 2) bases, for alpha in [0, 1].
+    """
+    q, r = np.linalg.qr((1 - alpha) * start + alpha * end)
+    # Keep the orientation of the plane continuous along the way.
+    return q * np.where(np.diag(r) < 0, -1, 1)
+
+
+def root_edges(roots):
+    """
+    Index pairs (i < j) of roots at the minimal distance, i.e. with inner product 1,
+    found from the Gram matrix: the edges of the polytope whose vertices are the roots.
+    """
+    gram = roots @ roots.T
+    return np.argwhere(np.triu(np.isclose(gram, 1), k=1))
+
+
+class GossetProjection(VGroup):
+    """
+    The 240 E8 roots (the vertices of the Gosset polytope 4_21) and its 6720 edges,
+    projected onto a plane.
+
+    Edges are grouped by the outermost ring of the Coxeter projection they reach; each
+    group is one VMobject holding all of its edges as separate straight subpaths, so
+    the groups can be faded in shell by shell. set_projection() reprojects everything
+    with one matrix product per frame.
+    """
+
+    def __init__(self, scale=3.0, projection=None, vertex_radius=0.03,
+                 colors=(BLUE_E, BLUE, TEAL, GREEN, YELLOW, GOLD, ORANGE, RED), stroke_width=0.6, **kwargs):
+        super().__init__(**kwargs)
+        self.scale_factor = scale
+        self.roots = e8_shell_vectors(1)
+        self.edges = root_edges(self.roots)
+        self.coxeter_projection = coxeter_plane()
+        self.projection = self.coxeter_projection if projection is None else np.asarray(projection, dtype=float)
+
+        # Rings of the Coxeter projection; every edge belongs to the ring of its outer end.
+        radii = np.round(np.linalg.norm(self.roots @ self.coxeter_projection, axis=1), 6)
+        ring_radii, ring_of_root = np.unique(radii, return_inverse=True)
+        edge_ring = ring_of_root[self.edges].max(axis=1)
+        ring_colors = color_gradient(list(colors), len(ring_radii))
+        self.ring_edges = [self.edges[edge_ring == ring] for ring in range(len(ring_radii))]
+        self.edge_layers = VGroup(*[
+            VMobject(stroke_color=ring_colors[ring], stroke_width=stroke_width)
+            for ring in range(len(ring_radii))
+        ])
+        self.vertices = InstancedShape(Dot(radius=vertex_radius), np.zeros((len(self.roots), 3)),
+                                       fill_color=WHITE, fill_opacity=1, stroke_width=0)
+        self.add(self.edge_layers, self.vertices)
+        self.set_projection(self.projection)
+
+    def set_projection(self, projection):
+        """
+        Project the roots with a (8, 2) orthonormal basis and redraw all edges.
+        """
+        self.projection = np.asarray(projection, dtype=float)
+        # The roots come in +- pairs, so the vertices are always centered on the projection origin.
+        origin = self.vertices.get_center() if len(self.vertices.points) else ORIGIN
+        positions = np.zeros((len(self.roots), 3))
+        positions[:, :2] = self.roots @ self.projection * self.scale_factor
+        positions += origin
+        thirds = np.linspace(0, 1, 4)[None, :, None]
+        for layer, edges in zip(self.edge_layers, self.ring_edges):
+            start, end = positions[edges[:, 0]], positions[edges[:, 1]]
+            layer.points = (start[:, None, :] + thirds * (end - start)[:, None, :]).reshape(-1, 3)
+        self.vertices.set_instances(positions)
+        return self
+
+
+class RotateProjection(Animation):
+    """
+    Turn a GossetProjection from its current projection plane to another one.
+    """
+
+    def __init__(self, gosset, projection, **kwargs):
+        self.end_projection = np.asarray(projection, dtype=float)
+        super().__init__(gosset, **kwargs)
+
+    def create_starting_mobject(self):
+        return self.mobject
+
+    def begin(self):
+        self.start_projection = self.mobject.projection.copy()
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        t = self.rate_func(alpha)
+        self.mobject.set_projection(interpolate_projection(self.start_projection, self.end_projection, t))
@@ -0,0 +1,100 @@
+from manim import *
+import numpy as np
+
+# Points at which CreateInstances tabulates its rate function.
+RATE_SAMPLES = 1025
+
+
+def partial_curves(curves, progress):
+    """
+    The first `progress` (0..1) of a path of cubic curves, for many progress values.
+
+    curves has shape (C, 4, 3) and progress shape (n,); the result has shape
+    (n, C, 4, 3). The unfinished part of each copy collapses onto the point where
+    drawing stopped, so every copy keeps C curves.
+    """
+    num_curves = len(curves)
+    reached = np.asarray(progress, dtype=float)[:, None] * num_curves - np.arange(num_curves)
+    t = np.clip(reached, 0, 1)[..., None]
+    p0, p1, p2, p3 = (curves[None, :, i] for i in range(4))
+
+    # De Casteljau split of every curve at its own t, keeping the part before t.
+    a, b, c = p0 + t * (p1 - p0), p1 + t * (p2 - p1), p2 + t * (p3 - p2)
+    d, e = a + t * (b - a), b + t * (c - b)
+    f = d + t * (e - d)
+    partial = np.stack([np.broadcast_to(p0, f.shape), a, d, f], axis=2)
+
+    # Curves that have not started yet sit on the end of the last drawn one.
+    current = np.minimum(np.floor(reached[:, 0]), num_curves - 1).astype(int)
+    stop = partial[np.arange(len(partial)), current, 3]
+    waiting = reached <= 0
+    partial[waiting] = np.broadcast_to(stop[:, None, None, :], partial.shape)[waiting]
+    return partial
+
+
+class InstancedShape(VMobject):
+    """
+    Many copies of one template path, drawn as a single VMobject.
+
+    Each instance is the template's path, centered on the origin, scaled by scales[i]
+    and moved to offsets[i] (the style comes from kwargs). All instances are separate
+    subpaths of one point array, so thousands of circles cost about as much as one
+    path with many curves. progress[i] says how much of instance i is drawn, which
+    CreateInstances animates.
+    """
+
+    def __init__(self, template, offsets, scales=1, **kwargs):
+        super().__init__(**kwargs)
+        nppcc = self.n_points_per_cubic_curve
+        self.template_curves = (template.points - template.get_center()).reshape(-1, nppcc, 3)
+        self.set_instances(offsets, scales)
+
+    def set_instances(self, offsets, scales=1, progress=1):
+        """
+        Replace all instances by copies at `offsets` ((n, 2) or (n, 3)).
+        """
+        offsets = np.asarray(offsets, dtype=float).reshape(-1, np.shape(offsets)[-1])
+        self.offsets = np.zeros((len(offsets), 3))
+        self.offsets[:, :offsets.shape[1]] = offsets
+        self.scales = np.broadcast_to(np.asarray(scales, dtype=float), len(offsets)).copy()
+        return self.set_progress(progress)
+
+    def set_progress(self, progress):
+        """
+        Draw the first `progress` of every instance (a scalar or one value per instance).
+        """
+        self.progress = np.broadcast_to(np.asarray(progress, dtype=float), len(self.offsets)).copy()
+        if len(self.offsets) == 0:
+            self.points = np.zeros((0, 3))
+            return self
+        curves = partial_curves(self.template_curves, self.progress)
+        curves = curves * self.scales[:, None, None, None] + self.offsets[:, None, None, :]
+        self.points = curves.reshape(-1, 3)
+        return self
+
+
+class CreateInstances(Animation):
+    """
+    Draw the instances of an InstancedShape one after another, like a LaggedStart of
+    Create animations with the same lag_ratio, but computing every instance's
+    progress in one vectorized step. rate_func applies to each instance; it is sampled
+    once when the animation begins and interpolated from that table every frame.
+    """
+
+    def __init__(self, shape, lag_ratio=0.05, **kwargs):
+        kwargs.setdefault("run_time", 1 + max(len(shape.offsets) - 1, 0) * lag_ratio)
+        super().__init__(shape, lag_ratio=lag_ratio, introducer=True, **kwargs)
+
+    def begin(self):
+        self._rate_grid = np.linspace(0, 1, RATE_SAMPLES)
+        self._rate_values = np.array([self.rate_func(t) for t in self._rate_grid])
+        super().begin()
+
+    def create_starting_mobject(self):
+        return self.mobject
+
+    def interpolate_mobject(self, alpha):
+        count = len(self.mobject.offsets)
+        total = 1 + max(count - 1, 0) * self.lag_ratio
+        local = np.clip(alpha * total - np.arange(count) * self.lag_ratio, 0, 1)
+        self.mobject.set_progress(np.interp(local, self._rate_grid, self._rate_values))
@@ -1,8 +1,10 @@
 from manim import *
 import numpy as np
-import random
 from scipy.spatial import Voronoi
-from shapely.geometry import Polygon as ShapelyPolygon, box
+from batch_animation import AnimateAttributes
+from kmeans_engine import best_of_restarts
+from point_cloud import PointCloud
+from voronoi_geometry import clip_cells, finite_voronoi_cells
 
 # Define spawn area boundaries (leaving space at top for formulas)
 x_min, x_max = -6, 3.5
@@ -10,59 +12,16 @@ y_min, y_max = -2.9, 2
 margin = 0.6  # Margin from the borders for data points
 centroid_margin = margin * 2.1 # Larger margin for centroids to offset them from the borders
 
-def voronoi_finite_polygons_2d(vor, radius=None):
-    """
-    Reconstruct infinite Voronoi regions in a 2D diagram to finite regions.
-    """
-    if vor.points.shape[1] != 2:
-        raise ValueError("Requires 2D input")
-    new_regions = []
-    new_vertices = vor.vertices.tolist()
-    center = vor.points.mean(axis=0)
-    if radius is None:
-        radius = vor.points.ptp().max() * 2
-
-    # Map all ridges for each point.
-    all_ridges = {}
-    for (p1, p2), (v1, v2) in zip(vor.ridge_points, vor.ridge_vertices):
-        all_ridges.setdefault(p1, []).append((p2, v1, v2))
-        all_ridges.setdefault(p2, []).append((p1, v1, v2))
-
-    # Reconstruct infinite regions.
-    for p1, region_index in enumerate(vor.point_region):
-        region = vor.regions[region_index]
-        if all(v >= 0 for v in region):
-            new_regions.append(region)
-            continue
-
-        ridges = all_ridges[p1]
-        new_region = [v for v in region if v >= 0]
-
-        for p2, v1, v2 in ridges:
-            if v2 < 0:
-                v1, v2 = v2, v1
-            if v1 >= 0:
-                continue
-
-            tangent = vor.points[p2] - vor.points[p1]
-            tangent /= np.linalg.norm(tangent)
-            normal = np.array([-tangent[1], tangent[0]])
-            midpoint = vor.points[[p1, p2]].mean(axis=0)
-            direction = np.sign(np.dot(midpoint - center, normal)) * normal
-            far_point = vor.vertices[v2] + direction * radius
-
-            new_region.append(len(new_vertices))
-            new_vertices.append(far_point.tolist())
-
-        vs = np.array([new_vertices[v] for v in new_region])
-        c = vs.mean(axis=0)
-        angles = np.arctan2(vs[:, 1] - c[1], vs[:, 0] - c[0])
-        new_region = [v for _, v in sorted(zip(angles, new_region))]
-        new_regions.append(new_region)
-
-    return new_regions, np.array(new_vertices)
 
 class KMeansVoronoiScene(Scene):
+    # K-means solver from kmeans_engine.SOLVERS; "hamerly" and "minibatch" are meant for
+    # large datasets, all of them record the same per-iteration history.
+    solver = "lloyd"
+    # The data, the k-means++ seedings and the restarts all derive from this seed, and the
+    # lowest-inertia restart is animated, so every render shows the same result.
+    kmeans_seed = 0
+    restarts = 8
+
     def construct(self):
 
 
@@ -118,59 +77,40 @@ class KMeansVoronoiScene(Scene):
         ]
 
         # Create data points around each cluster center.
-        data_dots = VGroup()
-        for center in cluster_centers:
-            for _ in range(points_per_cluster):
-                offset = np.random.normal(0, 0.5, size=2)
-                raw_point = np.array([
-                    center[0] + offset[0],
-                    center[1] + offset[1],
-                    0
-                ])
-                point_position = np.array([
-                    np.clip(raw_point[0], x_min + margin, x_max - margin),
-                    np.clip(raw_point[1], y_min + margin, y_max - margin),
-                    0
-                ])
-                dot = Dot(point_position, radius=0.05, color=WHITE)
-                data_dots.add(dot)
+        centers = np.array([center[:2] for center in cluster_centers])
+        rng = np.random.default_rng(self.kmeans_seed)
+        offsets = rng.normal(0, 0.5, size=(num_clusters, points_per_cluster, 2))
+        data = (centers[:, None, :] + offsets).reshape(-1, 2)
+        data = np.clip(data, [x_min + margin, y_min + margin], [x_max - margin, y_max - margin])
+        data_dots = PointCloud(data, radii=0.05, colors=WHITE)
 
         self.play(FadeIn(data_dots), run_time=2)
         self.wait(1)
 
-        # Initialize centroids at random positions.
-        centroid_positions = [
-            np.array([random.uniform(x_min + centroid_margin, x_max - centroid_margin),
-                      random.uniform(y_min + centroid_margin, y_max - centroid_margin), 0])
-            for _ in range(num_clusters)
-        ]
+        # Run K-means up front from several k-means++ seedings and keep the best run;
+        # the animation below only replays its recorded states.
+        iterations = 5
+        history = best_of_restarts(data, num_clusters, restarts=self.restarts, seed=self.kmeans_seed,
+                                   max_iter=iterations, solver=self.solver)
+
         centroid_dots = VGroup()
         colors = [RED, GREEN, BLUE, ORANGE]
+        palette = np.array([color_to_rgba(color) for color in colors])
         for i in range(num_clusters):
-            centroid_dot = Dot(centroid_positions[i], radius=0.1, color=colors[i])
+            centroid_dot = Dot(np.append(history.centroids[0][i], 0), radius=0.1, color=colors[i])
             centroid_dot.cluster_index = i
             centroid_dots.add(centroid_dot)
 
         self.play(FadeIn(centroid_dots))
         self.wait(1)
 
-        # Run several iterations of the K‑means algorithm.
-        iterations = 5
-        for _ in range(iterations):
+        for step in range(history.num_iterations):
             # 1. Assignment Step: Highlight assignment formula (blue rectangle)
             assignment_rect = SurroundingRectangle(formula_assignment, color=BLUE, buff=0.1)
             self.play(Create(assignment_rect), run_time=0.5)
 
-            # Assign each point to the nearest centroid.
-            assignments = []
-            color_anims = []
-            for dot in data_dots:
-                point = dot.get_center()
-                distances = [np.linalg.norm(point - c.get_center()) for c in centroid_dots]
-                cluster_index = int(np.argmin(distances))
-                assignments.append(cluster_index)
-                color_anims.append(dot.animate.set_color(colors[cluster_index]))
-            self.play(*color_anims, run_time=1)
+            # Color each point by its nearest centroid.
+            self.play(data_dots.animate.set_point_colors(palette[history.assignments[step]]), run_time=1)
             self.wait(0.5)
             self.play(FadeOut(assignment_rect), run_time=0.5)
 
@@ -178,57 +118,25 @@ class KMeansVoronoiScene(Scene):
             update_rect = SurroundingRectangle(formula_update, color=BLUE, buff=0.1)
             self.play(Create(update_rect), run_time=0.5)
 
-            # Update centroids.
-            new_centroid_positions = []
-            for i in range(num_clusters):
-                assigned_points = [
-                    dot.get_center()
-                    for dot, assign in zip(data_dots, assignments)
-                    if assign == i
-                ]
-                if assigned_points:
-                    new_pos = np.mean(assigned_points, axis=0)
-                else:
-                    new_pos = centroid_dots[i].get_center()
-                new_centroid_positions.append(new_pos)
-
-            centroid_anims = []
-            for centroid_dot, new_pos in zip(centroid_dots, new_centroid_positions):
-                centroid_anims.append(centroid_dot.animate.move_to(new_pos))
-            self.play(*centroid_anims, run_time=1)
+            # Move the centroids to the means of their clusters.
+            self.play(AnimateAttributes(centroid_dots, centers=history.centroids[step + 1]), run_time=1)
             self.wait(0.5)
             self.play(FadeOut(update_rect), run_time=0.5)
 
         # Final re-assignment to update dot colors.
-        assignments = []
-        color_anims = []
-        for dot in data_dots:
-            point = dot.get_center()
-            distances = [np.linalg.norm(point - c.get_center()) for c in centroid_dots]
-            cluster_index = int(np.argmin(distances))
-            assignments.append(cluster_index)
-            color_anims.append(dot.animate.set_color(colors[cluster_index]))
-        self.play(*color_anims, run_time=1)
+        self.play(data_dots.animate.set_point_colors(palette[history.final_assignments]), run_time=1)
         self.wait(0.5)
 
         # -------------------------------
         # PART 2: DRAW THE VORONOI DIAGRAM CLIPPED TO THE SPAWN AREA
         # -------------------------------
-        centroid_points = np.array([dot.get_center()[:2] for dot in centroid_dots])
+        centroid_points = history.final_centroids
         vor = Voronoi(centroid_points)
-        regions, vertices = voronoi_finite_polygons_2d(vor, radius=90)
-        bounding_box_shp = box(x_min, y_min, x_max, y_max)
+        cells = finite_voronoi_cells(vor, radius=90)
+        clipped_cells = clip_cells(cells, (x_min, y_min, x_max, y_max))
 
         voronoi_polygons = VGroup()
-        for i, region in enumerate(regions):
-            pts = [[vertices[v][0], vertices[v][1]] for v in region]
-            shp_poly = ShapelyPolygon(pts)
-            clipped_poly = shp_poly.intersection(bounding_box_shp)
-            if clipped_poly.is_empty:
-                continue
-            clipped_coords = list(clipped_poly.exterior.coords)
-            if len(clipped_coords) > 1 and clipped_coords[0] == clipped_coords[-1]:
-                clipped_coords = clipped_coords[:-1]
+        for i, clipped_coords in zip(clipped_cells.ids, clipped_cells):
             manim_pts = [np.array([p[0], p[1], 0]) for p in clipped_coords]
             # Create polygon with visible stroke but invisible fill initially.
             poly = Polygon(*manim_pts, color=colors[i], stroke_width=3)
@@ -239,5 +147,5 @@ class KMeansVoronoiScene(Scene):
         self.play(Create(voronoi_polygons), run_time=2)
         self.wait(1)
         # Then, fade in the fill of each cell.
-        self.play(*[poly.animate.set_fill(opacity=0.2) for poly in voronoi_polygons], run_time=2)
+        self.play(AnimateAttributes(voronoi_polygons, fill_opacities=0.2), run_time=2)
         self.wait(2)
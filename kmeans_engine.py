@@ -0,0 +1,264 @@
+import time
+from itertools import repeat
+import numpy as np
+from process_pool import process_map
+
+
+def squared_distances(points, centroids):
+    """
+    Squared distances between every point and every centroid, shape (n, k).
+    Uses |x|^2 - 2 x.c + |c|^2 so no (n, k, d) intermediate is built.
+    """
+    d2 = (np.einsum("ij,ij->i", points, points)[:, None]
+          - 2 * points @ centroids.T
+          + np.einsum("ij,ij->i", centroids, centroids)[None, :])
+    return np.maximum(d2, 0, out=d2)
+
+
+def assign_points(points, centroids):
+    """
+    Index of the nearest centroid of every point and the squared distance to it.
+    """
+    d2 = squared_distances(points, centroids)
+    labels = d2.argmin(axis=1)
+    return labels, d2[np.arange(len(points)), labels]
+
+
+def update_centroids(points, labels, centroids):
+    """
+    Mean of the points assigned to every centroid. Centroids that lost all of their
+    points stay where they are.
+    """
+    k = len(centroids)
+    counts = np.bincount(labels, minlength=k)
+    sums = np.column_stack([np.bincount(labels, weights=points[:, axis], minlength=k)
+                            for axis in range(points.shape[1])])
+    occupied = counts > 0
+    updated = np.array(centroids, dtype=float)
+    updated[occupied] = sums[occupied] / counts[occupied, None]
+    return updated
+
+
+def _two_nearest(d2):
+    """
+    Nearest centroid, distance to it and distance to the second nearest, from (n, k)
+    squared distances.
+    """
+    labels = d2.argmin(axis=1)
+    if d2.shape[1] < 2:
+        return labels, np.sqrt(d2[:, 0]), np.full(len(d2), np.inf)
+    nearest_two = np.partition(d2, 1, axis=1)
+    return labels, np.sqrt(nearest_two[:, 0]), np.sqrt(nearest_two[:, 1])
+
+
+def _lloyd_states(points, centroids, **_):
+    """
+    Brute-force Lloyd's iterations: every point is compared with every centroid.
+    """
+    while True:
+        labels, _ = assign_points(points, centroids)
+        yield centroids, labels
+        centroids = update_centroids(points, labels, centroids)
+
+
+def _hamerly_states(points, centroids, **_):
+    """
+    Lloyd's iterations accelerated with Hamerly's triangle-inequality bounds.
+
+    Every point keeps an upper bound on the distance to its centroid and a lower bound
+    on the distance to any other one. Only points whose bounds overlap are compared
+    with all centroids again; the assignments are exactly those of Lloyd's algorithm.
+    """
+    labels, upper, lower = _two_nearest(squared_distances(points, centroids))
+    while True:
+        yield centroids, labels
+        updated = update_centroids(points, labels, centroids)
+        moved = np.sqrt(((updated - centroids) ** 2).sum(axis=1))
+        centroids = updated
+
+        # Centroids only moved by `moved`, so the bounds loosen by at most that much.
+        upper += moved[labels]
+        order = np.argsort(moved)
+        largest = moved[order[-1]]
+        second = moved[order[-2]] if len(moved) > 1 else 0
+        lower -= np.where(labels == order[-1], second, largest)
+
+        # No other centroid can be closer than half the gap to the nearest one.
+        gaps = np.sqrt(squared_distances(centroids, centroids))
+        np.fill_diagonal(gaps, np.inf)
+        bound = np.maximum(gaps.min(axis=1)[labels] / 2, lower)
+
+        check = np.nonzero(upper > bound)[0]
+        upper[check] = np.sqrt(((points[check] - centroids[labels[check]]) ** 2).sum(axis=1))
+        check = check[upper[check] > bound[check]]
+        if len(check):
+            labels[check], upper[check], lower[check] = _two_nearest(squared_distances(points[check], centroids))
+
+
+def _minibatch_states(points, centroids, batch_size=1024, seed=None, **_):
+    """
+    Mini-batch K-means: every update only looks at a random batch of points and moves
+    each centroid towards its batch mean with a step size of 1 / (points seen so far).
+    Assignments of the whole dataset are left to the caller.
+    """
+    rng = np.random.default_rng(seed)
+    k = len(centroids)
+    seen = np.zeros(k)
+    centroids = centroids.copy()
+    while True:
+        yield centroids, None
+        batch = points[rng.integers(len(points), size=min(batch_size, len(points)))]
+        labels, _ = assign_points(batch, centroids)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.column_stack([np.bincount(labels, weights=batch[:, axis], minlength=k)
+                                for axis in range(points.shape[1])])
+        seen += counts
+        occupied = counts > 0
+        centroids = centroids.copy()
+        centroids[occupied] += (sums[occupied] - counts[occupied, None] * centroids[occupied]) / seen[occupied, None]
+
+
+SOLVERS = {
+    "lloyd": _lloyd_states,
+    "hamerly": _hamerly_states,
+    "minibatch": _minibatch_states,
+}
+
+
+class KMeansHistory:
+    """
+    Every state of a K-means run, stacked into arrays.
+
+    State t holds the centroids before the t-th update and the assignment of the points
+    to them: centroids[t] has shape (k, d), assignments[t] shape (n,), and inertia[t] is
+    the sum of squared distances of that assignment. The last state is the final
+    re-assignment to the converged (or last) centroids. Runs without history keep only
+    that last state; num_iterations still counts every centroid update.
+    """
+
+    def __init__(self, points, centroids, assignments, inertia, converged, num_iterations=None):
+        self.points = points
+        self.centroids = np.asarray(centroids)
+        self.assignments = np.asarray(assignments)
+        self.inertia = np.asarray(inertia)
+        self.converged = converged
+        self.num_iterations = len(self.centroids) - 1 if num_iterations is None else num_iterations
+
+    def __len__(self):
+        return len(self.centroids)
+
+    @property
+    def final_centroids(self):
+        return self.centroids[-1]
+
+    @property
+    def final_assignments(self):
+        return self.assignments[-1]
+
+
+def run_kmeans(points, initial_centroids, max_iter=100, tol=1e-4, solver="lloyd", history=True,
+               batch_size=1024, seed=None):
+    """
+    Run K-means on an (n, d) array and record its history.
+
+    solver is one of SOLVERS: "lloyd" (brute force), "hamerly" (same iterates, fewer
+    distance computations) or "minibatch" (approximate updates from batch_size random
+    points, drawn with `seed`). Stops after max_iter updates, or earlier once no
+    centroid moves more than tol. With history=False only the final state is kept,
+    which also spares the mini-batch solver a full assignment pass per iteration.
+    """
+    if solver not in SOLVERS:
+        raise ValueError(f"Unknown solver {solver!r}, expected one of {sorted(SOLVERS)}")
+    points = np.asarray(points, dtype=float)
+    states = SOLVERS[solver](points, np.array(initial_centroids, dtype=float),
+                             batch_size=batch_size, seed=seed)
+
+    all_centroids, all_assignments, all_inertia = [], [], []
+
+    def record(centroids, labels):
+        if labels is None:
+            labels, _ = assign_points(points, centroids)
+        all_centroids.append(centroids.copy())
+        all_assignments.append(labels.copy())
+        all_inertia.append(((points - centroids[labels]) ** 2).sum())
+
+    centroids, labels = next(states)
+    converged = False
+    iteration = 0
+    while iteration < max_iter:
+        if history:
+            record(centroids, labels)
+        previous = centroids.copy()
+        centroids, labels = next(states)
+        iteration += 1
+        if np.sqrt(((centroids - previous) ** 2).sum(axis=1)).max() <= tol:
+            converged = True
+            break
+
+    record(centroids, labels)
+    return KMeansHistory(points, all_centroids, all_assignments, all_inertia, converged, iteration)
+
+
+def kmeans_plus_plus(points, k, seed=None):
+    """
+    Initial centroids by k-means++ seeding: every new centroid is a data point drawn
+    with probability proportional to its squared distance to the nearest centroid so far.
+    """
+    rng = np.random.default_rng(seed)
+    points = np.asarray(points, dtype=float)
+    centroids = np.empty((k, points.shape[1]))
+    centroids[0] = points[rng.integers(len(points))]
+    closest = squared_distances(points, centroids[:1])[:, 0]
+    for i in range(1, k):
+        total = closest.sum()
+        if total > 0:
+            index = np.searchsorted(np.cumsum(closest), rng.random() * total, side="right")
+        else:
+            index = rng.integers(len(points))
+        centroids[i] = points[min(index, len(points) - 1)]
+        np.minimum(closest, squared_distances(points, centroids[i:i + 1])[:, 0], out=closest)
+    return centroids
+
+
+def _seeded_run(seed, points, k, kwargs):
+    """
+    One k-means++ seeded run (worker process).
+    """
+    seeding, solver = seed.spawn(2)
+    kwargs = dict(kwargs, seed=solver)
+    return run_kmeans(points, kmeans_plus_plus(points, k, seeding), **kwargs)
+
+
+def best_of_restarts(points, k, restarts=8, seed=0, processes=None, **kwargs):
+    """
+    Run k-means `restarts` times from independent k-means++ seedings and return the
+    KMeansHistory with the lowest final inertia.
+
+    The restarts run in a process pool; each one gets its own child of `seed`, so the
+    result does not depend on the number of workers. Extra arguments go to run_kmeans.
+    """
+    points = np.asarray(points, dtype=float)
+    seeds = np.random.SeedSequence(seed).spawn(restarts)
+    runs = process_map(_seeded_run, seeds, repeat(points), repeat(k), repeat(kwargs), processes=processes)
+    return min(runs, key=lambda run: run.inertia[-1])
+
+
+def benchmark(num_points=200_000, num_clusters=32, max_iter=20, batch_size=4096, seed=0):
+    """
+    Time every solver on the same blob dataset and print runtime and final inertia.
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(-10, 10, size=(num_clusters, 2))
+    points = centers[rng.integers(num_clusters, size=num_points)] + rng.normal(0, 0.7, size=(num_points, 2))
+    initial = points[rng.choice(num_points, num_clusters, replace=False)]
+    print(f"{num_points} points, {num_clusters} clusters, {max_iter} iterations")
+    for solver in SOLVERS:
+        start = time.perf_counter()
+        result = run_kmeans(points, initial, max_iter=max_iter, tol=0, solver=solver, history=False,
+                            batch_size=batch_size, seed=seed)
+        elapsed = time.perf_counter() - start
+        print(f"{solver:>10}: {elapsed:8.3f} s  inertia {result.inertia[-1]:.1f}")
+
+
+if __name__ == "__main__":
+    benchmark()
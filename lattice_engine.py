@@ -0,0 +1,139 @@
+import itertools
+import numpy as np
+
+
+def lll_reduce(basis, delta=0.75):
+    """
+    LLL-reduced copy of a basis given as rows, together with the unimodular matrix U
+    such that reduced = U @ basis.
+    """
+    basis = np.array(basis, dtype=float)
+    n = len(basis)
+    transform = np.eye(n)
+
+    def gram_schmidt(b):
+        ortho = np.zeros_like(b)
+        mu = np.zeros((n, n))
+        for i in range(n):
+            ortho[i] = b[i]
+            for j in range(i):
+                mu[i, j] = b[i] @ ortho[j] / (ortho[j] @ ortho[j])
+                ortho[i] -= mu[i, j] * ortho[j]
+        return ortho, mu
+
+    ortho, mu = gram_schmidt(basis)
+    k = 1
+    while k < n:
+        for j in range(k - 1, -1, -1):
+            q = np.round(mu[k, j])
+            if q:
+                basis[k] -= q * basis[j]
+                transform[k] -= q * transform[j]
+                ortho, mu = gram_schmidt(basis)
+        if ortho[k] @ ortho[k] >= (delta - mu[k, k - 1] ** 2) * (ortho[k - 1] @ ortho[k - 1]):
+            k += 1
+        else:
+            basis[[k, k - 1]] = basis[[k - 1, k]]
+            transform[[k, k - 1]] = transform[[k - 1, k]]
+            ortho, mu = gram_schmidt(basis)
+            k = max(k - 1, 1)
+    return basis, np.round(transform)
+
+
+class Lattice:
+    """
+    The lattice spanned by the rows of a square basis matrix.
+
+    Points are generated and closest-vector queries answered in bulk: queries are
+    rounded in the coordinates of an LLL-reduced basis (Babai rounding) and then
+    compared against every neighbouring coefficient vector within search_radius.
+    """
+
+    def __init__(self, basis, search_radius=1):
+        basis = np.array(basis, dtype=float)
+        if basis.ndim != 2 or basis.shape[0] != basis.shape[1]:
+            raise ValueError("Lattice basis must be a square matrix")
+        if abs(np.linalg.det(basis)) < 1e-12:
+            raise ValueError("Lattice basis vectors must be linearly independent")
+        self.basis = basis
+        self.dimension = len(basis)
+        self.reduced, _ = lll_reduce(basis)
+        self.reduced_inverse = np.linalg.inv(self.reduced)
+        self.search_offsets = np.array(
+            list(itertools.product(range(-search_radius, search_radius + 1), repeat=self.dimension)), dtype=float)
+
+    @classmethod
+    def square(cls, scale=1):
+        return cls(np.eye(2) * scale)
+
+    @classmethod
+    def hexagonal(cls, scale=1):
+        return cls(np.array([[1, 0], [0.5, np.sqrt(3) / 2]]) * scale)
+
+    @classmethod
+    def integer(cls, dimension):
+        """
+        The integer lattice Z^n.
+        """
+        return cls(np.eye(dimension))
+
+    @classmethod
+    def checkerboard(cls, dimension):
+        """
+        D_n: integer vectors with an even coordinate sum.
+        """
+        basis = np.zeros((dimension, dimension))
+        basis[0, :2] = -1
+        for i in range(1, dimension):
+            basis[i, i - 1], basis[i, i] = 1, -1
+        return cls(basis)
+
+    @property
+    def covolume(self):
+        return abs(np.linalg.det(self.basis))
+
+    def coordinates(self, vectors):
+        """
+        Coefficients of vectors in the (unreduced) basis.
+        """
+        return np.asarray(vectors, dtype=float) @ np.linalg.inv(self.basis)
+
+    def points_in_box(self, lower, upper):
+        """
+        All lattice points with lower <= x <= upper componentwise, as an (m, n) array.
+        """
+        lower, upper = np.asarray(lower, dtype=float), np.asarray(upper, dtype=float)
+        corners = np.array(list(itertools.product(*zip(lower, upper))))
+        coefficients = corners @ self.reduced_inverse
+        lo = np.floor(coefficients.min(axis=0)).astype(int)
+        hi = np.ceil(coefficients.max(axis=0)).astype(int)
+        grid = np.stack(np.meshgrid(*[np.arange(a, b + 1) for a, b in zip(lo, hi)], indexing="ij"), axis=-1)
+        points = grid.reshape(-1, self.dimension) @ self.reduced
+        points = np.round(points, 12)
+        inside = np.all((points >= lower - 1e-9) & (points <= upper + 1e-9), axis=1)
+        points = points[inside]
+        return points[np.lexsort(points.T[::-1])]
+
+    def short_vectors(self, max_norm):
+        """
+        All nonzero lattice vectors of length at most max_norm.
+        """
+        bound = np.full(self.dimension, max_norm)
+        points = self.points_in_box(-bound, bound)
+        norms = np.linalg.norm(points, axis=1)
+        return points[(norms > 1e-9) & (norms <= max_norm + 1e-9)]
+
+    def closest(self, vectors, chunk_size=65536):
+        """
+        Closest lattice point to every row of an (m, n) array.
+        """
+        vectors = np.asarray(vectors, dtype=float)
+        result = np.empty_like(vectors)
+        candidates = self.search_offsets @ self.reduced
+        for start in range(0, len(vectors), chunk_size):
+            chunk = vectors[start:start + chunk_size]
+            babai = np.round(chunk @ self.reduced_inverse) @ self.reduced
+            trial = babai[:, None, :] + candidates[None, :, :]
+            best = ((trial - chunk[:, None, :]) ** 2).sum(axis=2).argmin(axis=1)
+            result[start:start + chunk_size] = trial[np.arange(len(chunk)), best]
+        return result
@@ -0,0 +1,168 @@
+import numpy as np
+from disk_cache import cache_key, cache_path, load_cached
+
+DIMENSION = 24
+KISSING_NUMBER = 196560
+
+# Bump when the layout of the cached vectors changes.
+LEECH_FORMAT = 1
+
+# Generator polynomial 1 + x^2 + x^4 + x^5 + x^6 + x^10 + x^11 of the binary
+# quadratic residue code of length 23; adding a parity bit gives the Golay code.
+GOLAY_GENERATOR = np.array([1, 0, 1, 0, 1, 1, 1, 0, 0, 0, 1, 1])
+
+
+def golay_code():
+    """
+    All 4096 words of the extended binary Golay code, as a (4096, 24) uint8 array.
+    """
+    generator = np.zeros((12, 23), dtype=np.int64)
+    for shift in range(12):
+        generator[shift, shift:shift + 12] = GOLAY_GENERATOR
+    messages = (np.arange(4096)[:, None] >> np.arange(12)) & 1
+    words = messages @ generator % 2
+    parity = words.sum(axis=1) % 2
+    return np.column_stack([words, parity]).astype(np.uint8)
+
+
+def _word_ids(words):
+    """
+    Integer id of every 24-bit word, for set lookups.
+    """
+    return (words.astype(np.int64) << np.arange(DIMENSION)).sum(axis=-1)
+
+
+def in_leech(x):
+    """
+    Whether every row of an (..., 24) integer array lies in the Leech lattice, in the
+    usual coordinates scaled by sqrt(8): all coordinates have the same parity m, the
+    coordinates congruent to 2 (m = 0) or 1 (m = 1) mod 4 sit on a Golay codeword,
+    and the coordinate sum is 4m mod 8.
+    """
+    x = np.asarray(x, dtype=np.int64)
+    m = x[..., :1] % 2
+    same_parity = np.all(x % 2 == m, axis=-1)
+    marked = (x % 4) == np.where(m == 0, 2, 1)
+    on_codeword = np.isin(_word_ids(marked), _word_ids(golay_code()))
+    sum_ok = x.sum(axis=-1) % 8 == 4 * m[..., 0]
+    return same_parity & on_codeword & sum_ok
+
+
+def _enumerate_minimal_vectors():
+    """
+    The 196560 minimal vectors (squared norm 32 in sqrt(8)-scaled coordinates):
+    (+-2)^8 on an octad with an even number of minus signs, (-3, 1^23) with the signs
+    flipped on a codeword, and (+-4, +-4, 0^22).
+    """
+    code = golay_code()
+    octads = code[code.sum(axis=1) == 8].astype(bool)
+
+    # Even sign patterns for the 8 coordinates of an octad.
+    patterns = (np.arange(256)[:, None] >> np.arange(8)) & 1
+    patterns = patterns[patterns.sum(axis=1) % 2 == 0]
+    octad_positions = np.nonzero(octads)[1].reshape(len(octads), 8)
+    twos = np.zeros((len(octads), len(patterns), DIMENSION), dtype=np.int8)
+    rows = np.arange(len(octads))[:, None, None]
+    columns = np.arange(len(patterns))[None, :, None]
+    twos[rows, columns, octad_positions[:, None, :]] = np.where(patterns[None, :, :], -2, 2)
+
+    base = np.ones((DIMENSION, DIMENSION), dtype=np.int8) - 4 * np.eye(DIMENSION, dtype=np.int8)
+    signs = 1 - 2 * code.astype(np.int8)
+    threes = signs[:, None, :] * base[None, :, :]
+
+    i, j = np.triu_indices(DIMENSION, k=1)
+    fours = np.zeros((len(i), 4, DIMENSION), dtype=np.int8)
+    for k, (a, b) in enumerate([(4, 4), (4, -4), (-4, 4), (-4, -4)]):
+        fours[np.arange(len(i)), k, i] = a
+        fours[np.arange(len(i)), k, j] = b
+
+    vectors = np.vstack([v.reshape(-1, DIMENSION) for v in (twos, threes, fours)])
+    if len(vectors) != KISSING_NUMBER or not in_leech(vectors).all() \
+            or not np.all((vectors.astype(np.int64) ** 2).sum(axis=1) == 32):
+        raise RuntimeError("Leech minimal vectors do not match the expected shell")
+    return vectors
+
+
+def minimal_vectors(use_cache=True):
+    """
+    The 196560 minimal vectors of the Leech lattice as a (196560, 24) int8 array in
+    sqrt(8)-scaled coordinates (divide by sqrt(8) for a unimodular lattice with
+    minimal norm 4). Cached on disk after the first call.
+    """
+    if not use_cache:
+        return _enumerate_minimal_vectors()
+    return load_cached(cache_path("leech", cache_key(LEECH_FORMAT, "minimal_vectors"), ".npy"),
+                       _enumerate_minimal_vectors)
+
+
+def _reduced_basis_mod(generators, modulus):
+    """
+    Upper triangular basis of the lattice spanned by integer generators together with
+    modulus * Z^n, built by inserting generators with extended-gcd row operations.
+    """
+    n = generators.shape[1]
+    basis = modulus * np.eye(n, dtype=np.int64)
+    for vector in generators.astype(np.int64):
+        vector = vector % modulus
+        for column in range(n):
+            if vector[column] == 0:
+                continue
+            pivot = basis[column, column]
+            g, a, b = _extended_gcd(pivot, vector[column])
+            combined = a * basis[column] + b * vector
+            vector = (pivot // g) * vector - (vector[column] // g) * basis[column]
+            basis[column] = combined
+            basis[column, column + 1:] %= modulus
+            vector %= modulus
+    return basis
+
+
+def _extended_gcd(a, b):
+    old_r, r, old_s, s, old_t, t = a, b, 1, 0, 0, 1
+    while r:
+        q = old_r // r
+        old_r, r = r, old_r - q * r
+        old_s, s = s, old_s - q * s
+        old_t, t = t, old_t - q * t
+    return old_r, old_s, old_t
+
+
+def covolume(num_generators=300, seed=0):
+    """
+    Covolume of the sqrt(8)-scaled Leech lattice, 8^12.
+
+    The lattice contains 8 Z^24 (it has the minimal vectors 4e_i +- 4e_j), so a random
+    subset of minimal vectors plus 8 Z^24 is reduced to a triangular basis; every
+    minimal vector is then checked to lie in its span, which proves it is the whole
+    lattice.
+    """
+    vectors = minimal_vectors().astype(np.int64)
+    rng = np.random.default_rng(seed)
+    basis = _reduced_basis_mod(vectors[rng.choice(len(vectors), num_generators, replace=False)], 8)
+    remainder = vectors.copy()
+    for column in range(DIMENSION):
+        remainder -= np.outer(remainder[:, column] // basis[column, column], basis[column])
+    if np.any(remainder % 8):
+        raise RuntimeError("Sampled minimal vectors do not span the Leech lattice")
+    return float(np.prod(np.diag(basis).astype(float)))
+
+
+def center_density():
+    """
+    Center density rho^24 / covolume of the Leech lattice packing (exactly 1).
+    """
+    norm2 = (minimal_vectors()[:1].astype(np.int64) ** 2).sum()
+    return (np.sqrt(norm2) / 2) ** DIMENSION / covolume()
+
+
+def check_against_known(path="BestPackingKnown.txt"):
+    """
+    Compare the kissing number and the center density with the value for n = 24
+    listed in BestPackingKnown.txt. Returns (kissing number, density, listed density).
+    """
+    listed = np.loadtxt(path)[DIMENSION - 1]
+    kissing = len(minimal_vectors())
+    density = center_density()
+    if kissing != KISSING_NUMBER or not np.isclose(density, listed, rtol=1e-4):
+        raise RuntimeError(f"Leech lattice check failed: kissing {kissing}, density {density} vs {listed}")
+    return kissing, density, listed
@@ -0,0 +1,150 @@
+import sys
+import time
+from itertools import repeat
+import numpy as np
+from scipy.special import jv
+from magic_function import magic_pair
+from process_pool import process_map
+
+# Values smaller than this in absolute value count as zero; it sits well above the
+# quadrature error of magic_function and far below the size of the functions.
+TOLERANCE = 1e-9
+
+FUNCTIONS = ("g", "g_hat", "g'", "g_hat'")
+
+# Step of the centered difference for g'(sqrt 2); its truncation error is about 1e-10.
+DERIVATIVE_STEP = 1e-5
+DERIVATIVE_TOLERANCE = 1e-8
+
+# Radii where g_hat is compared with the Fourier transform of g, and how close they
+# have to be: the quadrature error of g (about 3e-10 at large r) is weighted by r^4
+# in the transform.
+TRANSFORM_RADII = (0.5, 0.75, 1.0, 1.25, 1.5, 2.0)
+TRANSFORM_TOLERANCE = 1e-6
+
+
+def _evaluate_chunk(radii, derivatives):
+    """
+    g and g_hat (and g', g_hat' if derivatives is set) at a chunk of radii, stacked
+    into one array.
+    """
+    values = magic_pair(radii)
+    if derivatives:
+        values += magic_pair(radii, derivative=True)
+    return np.stack(values)
+
+
+def evaluate(radii, derivatives=True, processes=None, chunk_size=20_000):
+    """
+    The stacked values of _evaluate_chunk for an array of radii, computed in chunks
+    in a process pool.
+    """
+    radii = np.asarray(radii, dtype=float)
+    chunks = [radii[start:start + chunk_size] for start in range(0, len(radii), chunk_size)]
+    return np.concatenate(process_map(_evaluate_chunk, chunks, repeat(derivatives), processes=processes), axis=1)
+
+
+def fourier_transform(radii, cutoff=4.0, panels=64, order=32, processes=None):
+    """
+    The Fourier transform in R^8 of g, computed from g alone at radii rho > 0:
+    2 pi rho^-3 int_0^cutoff g(r) J_3(2 pi rho r) r^4 dr, by composite Gauss-Legendre.
+    The cutoff 4 = sqrt(16) is a zero of g, beyond which |g| is below its quadrature error.
+    """
+    rho = np.asarray(radii, dtype=float)
+    nodes, weights = np.polynomial.legendre.leggauss(order)
+    edges = np.linspace(0, cutoff, panels + 1)
+    half = np.diff(edges)[:, None] / 2
+    r = (edges[:-1, None] + half * (nodes[None, :] + 1)).ravel()
+    weights = (half * weights[None, :]).ravel()
+    g = evaluate(r, derivatives=False, processes=processes)[0]
+    kernel = jv(3, 2 * np.pi * rho[:, None] * r[None, :])
+    return 2 * np.pi * rho ** -3 * (kernel @ (g * r ** 4 * weights))
+
+
+def check_magic_function(max_k=1000, grid_points=400_000, processes=None, tolerance=TOLERANCE):
+    """
+    Numerical check of the conditions in E8Conditions and Vanishing:
+
+    - g, g_hat, g' and g_hat' at every E8 radius sqrt(2k), k = 1 .. max_k. All of
+      them vanish except g'(sqrt 2): g has a simple zero there, where it changes sign.
+    - g <= 0 for sqrt(2) <= r and g_hat >= 0 for all r, on a uniform grid of
+      grid_points radii up to sqrt(2 max_k).
+
+    Two checks do not rely on the formulas behind magic_function: g'(sqrt 2) is
+    measured by a centered difference of g and compared with its exact value
+    -sqrt(2) / 60, and g_hat is compared with the Fourier transform of g at
+    TRANSFORM_RADII.
+
+    Returns a dict of results, including the throughput in radii per second.
+    """
+    start = time.perf_counter()
+    k = np.arange(1, max_k + 1)
+    lattice = evaluate(np.sqrt(2 * k), processes=processes)
+    grid = np.linspace(0, np.sqrt(2 * max_k), grid_points)
+    g, g_hat = evaluate(grid, derivatives=False, processes=processes)
+    elapsed = time.perf_counter() - start
+
+    around = np.sqrt(2) + np.array([DERIVATIVE_STEP, -DERIVATIVE_STEP])
+    g_around = evaluate(around, derivatives=False)[0]
+    g_prime = (g_around[0] - g_around[1]) / (2 * DERIVATIVE_STEP)
+    g_prime_residual = g_prime + np.sqrt(2) / 60
+    transform_residual = np.abs(fourier_transform(TRANSFORM_RADII, processes=processes)
+                                - evaluate(TRANSFORM_RADII, derivatives=False)[1]).max()
+
+    # The only entry expected to be nonzero is g'(sqrt 2).
+    expected_zero = np.ones(lattice.shape, dtype=bool)
+    expected_zero[2, 0] = False
+    largest = np.where(expected_zero, np.abs(lattice), 0).max(axis=1)
+    beyond = grid >= np.sqrt(2)
+    return {
+        "max_k": max_k,
+        "grid_points": grid_points,
+        "tolerance": tolerance,
+        "vanishing": dict(zip(FUNCTIONS, largest)),
+        "vanishing_ok": bool(np.all(largest <= tolerance)),
+        "g_prime_at_sqrt2": float(g_prime),
+        "g_prime_residual": float(g_prime_residual),
+        "g_prime_ok": bool(abs(g_prime_residual) <= DERIVATIVE_TOLERANCE),
+        "transform_residual": float(transform_residual),
+        "transform_ok": bool(transform_residual <= TRANSFORM_TOLERANCE),
+        "max_g_beyond_sqrt2": float(g[beyond].max()),
+        "g_sign_ok": bool(g[beyond].max() <= tolerance),
+        "min_g_hat": float(g_hat.min()),
+        "g_hat_sign_ok": bool(g_hat.min() >= -tolerance),
+        "seconds": elapsed,
+        "radii_per_second": (len(k) * 2 + grid_points) / elapsed,
+    }
+
+
+def write_report(results, path="MagicFunctionChecks.txt"):
+    """
+    Write the results of check_magic_function as a short plain-text report.
+    """
+    lines = [
+        f"Magic function checks for k = 1..{results['max_k']} "
+        f"(radii sqrt(2k)), tolerance {results['tolerance']:.0e}",
+    ]
+    for name, value in results["vanishing"].items():
+        lines.append(f"max |{name}(sqrt 2k)| = {value:.3e}")
+    lines += [
+        f"vanishing on E8 radii: {'pass' if results['vanishing_ok'] else 'FAIL'}",
+        f"g'(sqrt 2) = {results['g_prime_at_sqrt2']:.10f} by centered difference, "
+        f"{results['g_prime_residual']:+.1e} from -sqrt(2)/60 (simple zero, sign change): "
+        f"{'pass' if results['g_prime_ok'] else 'FAIL'}",
+        f"max |g_hat - Fourier transform of g| at {len(TRANSFORM_RADII)} radii = "
+        f"{results['transform_residual']:.3e}: {'pass' if results['transform_ok'] else 'FAIL'}",
+        f"max g(r) for r >= sqrt 2 on {results['grid_points']} radii = {results['max_g_beyond_sqrt2']:.3e}: "
+        f"{'pass' if results['g_sign_ok'] else 'FAIL'}",
+        f"min g_hat(r) on {results['grid_points']} radii = {results['min_g_hat']:.3e}: "
+        f"{'pass' if results['g_hat_sign_ok'] else 'FAIL'}",
+        f"throughput: {results['radii_per_second']:.0f} radii/s ({results['seconds']:.2f} s)",
+    ]
+    with open(path, "w") as file:
+        file.write("\n".join(lines) + "\n")
+    return lines
+
+
+if __name__ == "__main__":
+    max_k = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    print("\n".join(write_report(check_magic_function(max_k, processes=processes))))
@@ -0,0 +1,212 @@
+import time
+from functools import lru_cache
+import numpy as np
+from modular_forms import eisenstein_coefficients, series_inverse, series_mul, theta_coefficients
+
+# Terms kept in the q-series. The series are only evaluated where |q| <= e^(-pi), so
+# this is far beyond double precision.
+NUM_TERMS = 48
+
+
+@lru_cache(maxsize=None)
+def _phi_series(num_terms=NUM_TERMS):
+    """
+    q-series (q = e^(2 pi i z)) of (E2 E4 - E6)^2 / Delta, E4 (E2 E4 - E6) / Delta and
+    q E4^2 / Delta, the three pieces of phi_0(-1/z) z^2.
+    """
+    e2, e4, e6 = (eisenstein_coefficients(weight, num_terms) for weight in (2, 4, 6))
+    # Delta = (E4^3 - E6^2) / 1728 starts at q; work with Delta / q, which starts at 1.
+    delta = (series_mul(series_mul(e4, e4), e4) - series_mul(e6, e6)) / 1728
+    inverse_delta = series_inverse(np.append(delta[1:], 0.0))
+    difference = series_mul(e2, e4) - e6  # starts at q
+    shifted = np.append(difference[1:], 0.0)
+    squared = np.concatenate([[0.0], series_mul(series_mul(shifted, shifted), inverse_delta)[:-1]])
+    mixed = series_mul(series_mul(e4, shifted), inverse_delta)
+    quartic = series_mul(series_mul(e4, e4), inverse_delta)
+    return squared, mixed, quartic
+
+
+@lru_cache(maxsize=None)
+def _psi_series(num_terms=NUM_TERMS):
+    """
+    p-series (p = e^(pi i z)) of p^2 psi_I(z) and of psi_I(-1/z) / z^2, where
+    psi_I = 128 (th00^4 + th01^4) / th10^8 + 128 (th01^4 - th10^4) / th00^8.
+    """
+    th00, th01, tail = theta_coefficients(num_terms)  # th10 = 2 p^(1/4) tail
+
+    def fourth(series):
+        square = series_mul(series, series)
+        return series_mul(square, square)
+
+    a00, a01, tail4 = fourth(th00), fourth(th01), fourth(tail)
+    a10 = 16 * np.concatenate([[0.0], tail4[:-1]])  # th10^4 = 16 p tail^4
+    inverse_00 = series_inverse(series_mul(a00, a00))
+    # th10^8 = 256 p^2 tail^8, so p^2 psi_I = (a00 + a01) / (2 tail^8) + 128 p^2 (a01 - a10) / th00^8.
+    first = series_mul(a00 + a01, series_inverse(series_mul(tail4, tail4))) / 2
+    second = 128 * series_mul(a01 - a10, inverse_00)
+    at_cusp = first + np.concatenate([[0.0, 0.0], second[:-2]])
+    # th00, th01, th10 at -1/z are sqrt(-iz) times th00, th10, th01 at z.
+    at_zero = 128 * series_mul(a00 + a10, series_inverse(series_mul(a01, a01))) \
+        + 128 * series_mul(a10 - a01, inverse_00)
+    return at_cusp, at_zero
+
+
+def _phi_residual(t):
+    """
+    t^2 phi_0(i/t) minus its growing part 36/pi^2 e^(2 pi t) - 8640 t/pi + 18144/pi^2.
+    """
+    squared, mixed, quartic = _phi_series()
+    t = np.asarray(t, dtype=float)
+    residual = np.empty_like(t)
+    small = t < 1
+    # Near 0, i/t is high up the imaginary axis, where phi_0 = (E2 E4 - E6)^2 / Delta converges fast.
+    ts = t[small]
+    q = np.exp(-2 * np.pi / ts)
+    residual[small] = ts ** 2 * np.polynomial.polynomial.polyval(q, squared) \
+        - 36 / np.pi ** 2 * np.exp(2 * np.pi * ts) + 8640 * ts / np.pi - 18144 / np.pi ** 2
+    # Further out, the transformation of E2, E4 and E6 under z -> -1/z turns t^2 phi_0(i/t)
+    # into t^2 A - 12 t/pi B + 36/pi^2 C at it; the growing part is exactly the leading
+    # coefficients of B and C, so it is dropped from the series instead of subtracted.
+    tl = t[~small]
+    q = np.exp(-2 * np.pi * tl)
+    residual[~small] = tl ** 2 * np.polynomial.polynomial.polyval(q, squared) \
+        - 12 * tl / np.pi * q * np.polynomial.polynomial.polyval(q, mixed[1:]) \
+        + 36 / np.pi ** 2 * q * np.polynomial.polynomial.polyval(q, quartic[2:])
+    return residual
+
+
+def _psi_residual(t):
+    """
+    psi_I(it) minus its growing part e^(2 pi t) + 144.
+    """
+    at_cusp, at_zero = _psi_series()
+    t = np.asarray(t, dtype=float)
+    residual = np.empty_like(t)
+    small = t < 1
+    ts = t[small]
+    residual[small] = ts ** 2 * np.polynomial.polynomial.polyval(np.exp(-np.pi / ts), at_zero) \
+        - np.exp(2 * np.pi * ts) - 144
+    # p^2 psi_I = 1 + 0 p + 144 p^2 + ..., so the residual is the rest of the series over p^2.
+    tl = t[~small]
+    p = np.exp(-np.pi * tl)
+    residual[~small] = p * np.polynomial.polynomial.polyval(p, at_cusp[3:])
+    return residual
+
+
+@lru_cache(maxsize=None)
+def quadrature(num_panels=48, order=16, t_min=1e-10, t_max=16.0):
+    """
+    Nodes, weights and the residual integrands of both eigenfunctions at the nodes,
+    for integrals over t in (0, oo). Composite Gauss-Legendre in log t resolves the
+    e^(-pi r^2 t) factor of large radii; both integrands stay bounded at 0 and decay
+    like e^(-2 pi t). Memoized, so every radius reuses the modular-form values.
+    """
+    base_nodes, base_weights = np.polynomial.legendre.leggauss(order)
+    edges = np.linspace(np.log(t_min), np.log(t_max), num_panels + 1)
+    half = np.diff(edges)[:, None] / 2
+    s = (edges[:-1, None] + half * (base_nodes[None, :] + 1)).ravel()
+    t = np.exp(s)
+    weights = (half * base_weights[None, :]).ravel() * t
+    return t, weights, _phi_residual(t), _psi_residual(t)
+
+
+def _eigenfunction_integrals(radii, chunk_size=2048):
+    """
+    The bracketed factors of Viazovska's a(r) and b(r): a(r) = 4i sin^2(pi r^2 / 2) A(r)
+    and b(r) = 4i sin^2(pi r^2 / 2) B(r), analytically continued to all r > 0 by
+    integrating the growing parts of the integrands in closed form. Returns A, B and
+    their derivatives with respect to s = r^2.
+    """
+    t, weights, phi_residual, psi_residual = quadrature()
+    s = np.asarray(radii, dtype=float) ** 2
+    integrals = np.empty((4, len(s)))
+    residuals = np.column_stack([phi_residual, psi_residual, -np.pi * t * phi_residual, -np.pi * t * psi_residual])
+    for start in range(0, len(s), chunk_size):
+        kernel = np.exp(-np.pi * s[start:start + chunk_size, None] * t[None, :]) * weights
+        integrals[:, start:start + chunk_size] = (kernel @ residuals).T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = 36 / (np.pi ** 3 * (s - 2)) - 8640 / (np.pi ** 3 * s ** 2) + 18144 / (np.pi ** 3 * s) + integrals[0]
+        b = 144 / (np.pi * s) + 1 / (np.pi * (s - 2)) + integrals[1]
+        da = -36 / (np.pi ** 3 * (s - 2) ** 2) + 17280 / (np.pi ** 3 * s ** 3) - 18144 / (np.pi ** 3 * s ** 2) \
+            + integrals[2]
+        db = -144 / (np.pi * s ** 2) - 1 / (np.pi * (s - 2) ** 2) + integrals[3]
+    return a, b, da, db
+
+
+def _magic_parts(radii, derivative=False):
+    """
+    The +1 and -1 Fourier eigenfunction parts of the magic function, so that
+    g = even + odd and g_hat = even - odd, or their derivatives in r.
+    """
+    radii = np.abs(np.asarray(radii, dtype=float))
+    shape = radii.shape
+    radii = radii.ravel()
+    s = radii ** 2
+    a, b, da, db = _eigenfunction_integrals(radii)
+    sin2 = np.sin(np.pi * s / 2) ** 2
+    # g = pi i / 8640 a + i / (240 pi) b.
+    even_scale, odd_scale = -np.pi / 2160, -1 / (60 * np.pi)
+    at_zero = s < 1e-12
+    at_pole = np.isclose(s, 2, rtol=0, atol=1e-12)
+    with np.errstate(invalid="ignore"):
+        if derivative:
+            # d/dr [sin^2(pi s / 2) X(s)] = 2 r (pi / 2 sin(pi s) X + sin^2 X').
+            sin1 = np.sin(np.pi * s) * np.pi / 2
+            even = 2 * radii * even_scale * (sin1 * a + sin2 * da)
+            odd = 2 * radii * odd_scale * (sin1 * b + sin2 * db)
+        else:
+            even = even_scale * sin2 * a
+            odd = odd_scale * sin2 * b
+    # sin^2 cancels the poles at r^2 = 0 and 2; use the limits there. At r^2 = 2 both
+    # parts have residue -1 / (60 pi^2), so each has slope 2 sqrt(2) pi^2 / 4 times that.
+    if derivative:
+        even[at_zero], odd[at_zero] = 0.0, 0.0
+        even[at_pole] = odd[at_pole] = -np.sqrt(2) / 120
+    else:
+        even[at_zero], odd[at_zero] = 1.0, 0.0
+        even[at_pole], odd[at_pole] = 0.0, 0.0
+    return even.reshape(shape), odd.reshape(shape)
+
+
+def magic_pair(radii, derivative=False):
+    """
+    g and g_hat (or their derivatives in r) at every radius of an array, sharing one
+    evaluation of the integrals.
+    """
+    even, odd = _magic_parts(radii, derivative)
+    return even + odd, even - odd
+
+
+def magic_function(radii, derivative=False):
+    """
+    Viazovska's magic function g for E8, as a function of |x|, at every radius of an
+    array: g(0) = g_hat(0) = 1, g <= 0 for |x| >= sqrt(2), and g vanishes on the
+    nonzero E8 vectors. With derivative=True, g'(r) instead.
+    """
+    return magic_pair(radii, derivative)[0]
+
+
+def magic_transform(radii, derivative=False):
+    """
+    Fourier transform g_hat of the magic function, as a function of |x|
+    (or its derivative in r).
+    """
+    return magic_pair(radii, derivative)[1]
+
+
+def benchmark(num_radii=5000):
+    """
+    Time a plot's worth of radii and print a few known values.
+    """
+    quadrature()
+    radii = np.linspace(0, 4, num_radii)
+    start = time.perf_counter()
+    values, transform = magic_pair(radii)
+    elapsed = time.perf_counter() - start
+    print(f"{num_radii} radii (g and g_hat) in {elapsed:.3f} s")
+    print(f"g(0) = {values[0]:.10f}, g_hat(0) = {transform[0]:.10f}")
+    print(f"g(sqrt 2k), k = 1..4: {magic_function(np.sqrt(2 * np.arange(1, 5)))}")
+
+
+if __name__ == "__main__":
+    benchmark()
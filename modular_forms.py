@@ -0,0 +1,228 @@
+import time
+from fractions import Fraction
+from math import comb
+import numpy as np
+from disk_cache import cache_key, cache_path, load_cached
+
+# Bump when the layout of the cached coefficient tables changes.
+COEFFICIENT_FORMAT = 1
+
+# Truncation error aimed for when a series is summed at a given |q|.
+TOLERANCE = 1e-17
+
+
+def divisor_sums(power, num_terms):
+    """
+    sigma_power(n) = sum of d^power over the divisors d of n, for n < num_terms
+    (0 for n = 0), as float64.
+
+    Sieve over the factorizations n = d m: divisors up to sqrt(num_terms) add d^power
+    to every multiple with one strided slice each, and the larger divisors are added
+    for each small cofactor m at once, so both loops run about sqrt(num_terms) times.
+    """
+    sums = np.zeros(num_terms)
+    root = int(np.sqrt(num_terms))
+    for d in range(1, root + 1):
+        sums[d::d] += float(d) ** power
+    for m in range(1, (num_terms - 1) // (root + 1) + 1):
+        large = np.arange(root + 1, (num_terms - 1) // m + 1)
+        sums[large * m] += large.astype(float) ** power
+    return sums
+
+
+def bernoulli_number(k):
+    """
+    The Bernoulli number B_k as an exact Fraction (B_1 = -1/2).
+    """
+    numbers = [Fraction(1)]
+    for n in range(1, k + 1):
+        numbers.append(-sum(comb(n + 1, j) * numbers[j] for j in range(n)) / (n + 1))
+    return numbers[k]
+
+
+def _cached_table(name, num_terms, build):
+    """
+    A coefficient table, loaded from the disk cache or built and saved.
+    """
+    return load_cached(cache_path("modular_forms", cache_key(COEFFICIENT_FORMAT, name, num_terms), ".npy"), build)
+
+
+def eisenstein_coefficients(weight, num_terms, use_cache=True):
+    """
+    q-expansion coefficients of the normalized Eisenstein series
+    E_k = 1 - 2k / B_k sum sigma_(k-1)(n) q^n, for even k >= 2 (E2 is quasimodular).
+    """
+    if weight < 2 or weight % 2:
+        raise ValueError("Eisenstein series need an even weight of at least 2")
+
+    def build():
+        coefficients = float(-2 * weight / bernoulli_number(weight)) * divisor_sums(weight - 1, num_terms)
+        coefficients[0] = 1
+        return coefficients
+
+    return _cached_table(f"E{weight}", num_terms, build) if use_cache else build()
+
+
+def theta_coefficients(num_terms, use_cache=True):
+    """
+    Expansions of the Jacobi theta functions in the nome p = e^(pi i tau):
+    th00 = sum p^(n^2), th01 = sum (-1)^n p^(n^2) and th10 = 2 p^(1/4) sum p^(n(n+1)).
+    Returns a (3, num_terms) array; the last row leaves out the factor 2 p^(1/4).
+    """
+    def build():
+        n = np.arange(num_terms)
+        table = np.zeros((3, num_terms))
+        squares = n[n ** 2 < num_terms]
+        table[0, squares ** 2] = np.where(squares > 0, 2, 1)
+        table[1, squares ** 2] = table[0, squares ** 2] * (-1.0) ** squares
+        pronic = n * (n + 1)
+        table[2, pronic[pronic < num_terms]] = 1
+        return table
+
+    return _cached_table("theta", num_terms, build) if use_cache else build()
+
+
+def series_mul(a, b):
+    """
+    Product of two power series, truncated to the length of the first.
+    """
+    return np.convolve(a, b)[:len(a)]
+
+
+def series_inverse(a):
+    """
+    1 / a for a power series with a[0] != 0.
+    """
+    inverse = np.zeros_like(a)
+    inverse[0] = 1 / a[0]
+    for n in range(1, len(a)):
+        inverse[n] = -(a[1:n + 1] @ inverse[n - 1::-1]) / a[0]
+    return inverse
+
+
+def terms_needed(q, coefficients):
+    """
+    How many coefficients to sum so that the next term, bounded by |q|^n times the
+    largest coefficient, falls below TOLERANCE (at most len(coefficients)).
+    """
+    radius = np.max(np.abs(q)) if np.size(q) else 0.0
+    if radius == 0:
+        return 1
+    if radius >= 1:
+        raise ValueError("q-series only converge for |q| < 1")
+    scale = max(np.abs(coefficients).max(), 1.0)
+    return int(min(len(coefficients), np.ceil(np.log(TOLERANCE / scale) / np.log(radius)) + 1))
+
+
+def evaluate_series(coefficients, q):
+    """
+    sum coefficients[n] q^n at every entry of an array of q, by Horner's rule over
+    only as many terms as the largest |q| needs.
+    """
+    q = np.asarray(q)
+    count = terms_needed(q, coefficients)
+    total = np.full(q.shape, coefficients[count - 1], dtype=np.result_type(q, float))
+    for coefficient in coefficients[count - 2::-1]:
+        total = total * q + coefficient
+    return total
+
+
+def reduce_to_fundamental_domain(tau, max_steps=200):
+    """
+    Move every entry of an array of points in the upper half-plane into the standard
+    fundamental domain |Re tau| <= 1/2, |tau| >= 1 with T and S steps, all points at
+    once. Returns the reduced points and the entries (a, b, c, d) of the matrices
+    with reduced = (a tau + b) / (c tau + d).
+    """
+    tau = np.array(tau, dtype=complex)
+    if np.any(tau.imag <= 0):
+        raise ValueError("points must lie in the upper half-plane")
+    a, b, c, d = np.ones(tau.shape), np.zeros(tau.shape), np.zeros(tau.shape), np.ones(tau.shape)
+    for _ in range(max_steps):
+        # T^-n: tau -> tau - n.
+        shift = np.round(tau.real)
+        tau -= shift
+        a, b = a - shift * c, b - shift * d
+        outside = np.abs(tau) < 1 - 1e-12
+        if not outside.any():
+            break
+        # S: tau -> -1/tau.
+        tau[outside] = -1 / tau[outside]
+        a[outside], b[outside], c[outside], d[outside] = -c[outside], -d[outside], a[outside], b[outside]
+    return tau, (a, b, c, d)
+
+
+def eisenstein(weight, tau, num_terms=64):
+    """
+    E_k at every entry of an array of points in the upper half-plane.
+
+    Points are first reduced to the fundamental domain, where |q| <= e^(-pi sqrt 3)
+    and a few dozen terms reach double precision, and then mapped back with the
+    automorphy factor (c tau + d)^k, plus the extra term of the quasimodular E2.
+    """
+    reduced, (_, _, c, d) = reduce_to_fundamental_domain(tau)
+    factor = c * np.asarray(tau, dtype=complex) + d
+    value = evaluate_series(eisenstein_coefficients(weight, num_terms), np.exp(2j * np.pi * reduced))
+    if weight == 2:
+        # E2(g tau) = (c tau + d)^2 E2(tau) + 6 c (c tau + d) / (pi i).
+        value = value - 6 * c * factor / (np.pi * 1j)
+    return value / factor ** weight
+
+
+def discriminant(tau):
+    """
+    The modular discriminant Delta = (E4^3 - E6^2) / 1728 at an array of points.
+    """
+    e4, e6 = eisenstein(4, tau), eisenstein(6, tau)
+    return (e4 ** 3 - e6 ** 2) / 1728
+
+
+def j_invariant(tau):
+    """
+    Klein's j = 1728 E4^3 / (E4^3 - E6^2) at an array of points.
+    """
+    e4, e6 = eisenstein(4, tau), eisenstein(6, tau)
+    return 1728 * e4 ** 3 / (e4 ** 3 - e6 ** 2)
+
+
+def jacobi_theta(tau):
+    """
+    th00, th01 and th10 at an array of points, summed directly over n in the nome
+    p = e^(pi i tau) up to the last term above TOLERANCE.
+    """
+    tau = np.asarray(tau, dtype=complex)
+    p = np.exp(1j * np.pi * tau)
+    radius = np.max(np.abs(p)) if p.size else 0.0
+    if radius >= 1:
+        raise ValueError("theta series only converge in the upper half-plane")
+    last = int(np.sqrt(np.log(TOLERANCE) / np.log(radius))) + 1 if radius > 0 else 1
+    th00, th01, tail = np.ones_like(p), np.ones_like(p), np.ones_like(p)
+    for n in range(1, last + 1):
+        th00 += 2 * p ** (n * n)
+        th01 += 2 * (-1) ** n * p ** (n * n)
+        tail += p ** (n * (n + 1))
+    return th00, th01, 2 * np.exp(1j * np.pi * tau / 4) * tail
+
+
+def benchmark(num_terms=1_000_000, num_points=1_000_000, seed=0):
+    """
+    Time the divisor sieve and a batched evaluation, and check E4^3 - E6^2 against
+    the q-expansion of Delta, whose first coefficients are 1, -24, 252.
+    """
+    start = time.perf_counter()
+    divisor_sums(3, num_terms)
+    print(f"sigma_3 up to {num_terms} in {time.perf_counter() - start:.3f} s")
+
+    rng = np.random.default_rng(seed)
+    tau = rng.uniform(-2, 2, num_points) + 1j * rng.uniform(0.05, 2, num_points)
+    start = time.perf_counter()
+    e4, e6 = eisenstein(4, tau), eisenstein(6, tau)
+    print(f"E4 and E6 at {num_points} points in {time.perf_counter() - start:.3f} s")
+
+    e4, e6 = eisenstein_coefficients(4, 8), eisenstein_coefficients(6, 8)
+    delta = (series_mul(series_mul(e4, e4), e4) - series_mul(e6, e6)) / 1728
+    print(f"Delta coefficients: {delta[1:4]}")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,171 @@
+import sys
+import time
+import numpy as np
+from manim import *
+
+S = np.array([[0, -1], [1, 0]])
+T = np.array([[1, 1], [0, 1]])
+T_INVERSE = np.array([[1, -1], [0, 1]])
+
+# Corners of the standard fundamental domain: rho = e^(2 pi i / 3) and rho + 1.
+RHO = complex(-0.5, np.sqrt(3) / 2)
+
+
+def _normalize(matrices):
+    """
+    Representatives of +-M in PSL2(Z): the bottom row (c, d) is made positive in
+    lexicographic order.
+    """
+    c, d = matrices[:, 1, 0], matrices[:, 1, 1]
+    flip = (c < 0) | ((c == 0) & (d < 0))
+    matrices[flip] *= -1
+    return matrices
+
+
+def _keys(matrices):
+    """
+    One hashable bytes key per matrix.
+    """
+    return np.ascontiguousarray(matrices.reshape(-1, 4)).view(np.dtype((np.void, 32))).ravel().tolist()
+
+
+def mobius(matrices, z):
+    """
+    (a z + b) / (c z + d) for every matrix and point, with z = inf mapped to a / c
+    (inf when c = 0).
+    """
+    a, b, c, d = (matrices[:, i, j].astype(float) for i, j in ((0, 0), (0, 1), (1, 0), (1, 1)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if np.isinf(z):
+            return np.where(c == 0, np.inf, a / c).astype(complex)
+        return (a * z + b) / (c * z + d)
+
+
+def modular_tiles(max_depth=12, x_range=(-8, 8), min_height=0.01):
+    """
+    Matrices M of PSL2(Z) whose tiles M F (F the standard fundamental domain) can be
+    reached by words in S and T of length at most max_depth, as an (n, 2, 2) int64 array.
+
+    Words grow breadth-first: each level multiplies the whole frontier by S, T and
+    T^-1 at once. Duplicates (the same tile reached by another word) are dropped by
+    hashing the normalized matrices. Tiles whose real parts fall outside x_range,
+    or that are lower than min_height (a tile with bottom row (c, d) and c != 0 is at
+    most 2 / (sqrt(3) c^2) high), are not expanded further.
+    """
+    generators = np.stack([S, T, T_INVERSE])
+    frontier = np.eye(2, dtype=np.int64)[None]
+    seen = set(_keys(frontier))
+    tiles = [frontier]
+    max_c = np.sqrt(2 / (np.sqrt(3) * min_height)) if min_height else np.inf
+    for _ in range(max_depth):
+        candidates = _normalize((frontier[:, None] @ generators[None]).reshape(-1, 2, 2))
+        candidates = np.unique(candidates, axis=0)
+        fresh = np.array([key not in seen for key in _keys(candidates)], dtype=bool)
+        candidates = candidates[fresh]
+        # Where the tile sits on the real line: its cusp a / c, or its horizontal shift.
+        c = candidates[:, 1, 0]
+        center = mobius(candidates, complex(0, 2)).real
+        visible = (center >= x_range[0] - 1) & (center <= x_range[1] + 1) & (np.abs(c) <= max_c)
+        seen.update(_keys(candidates))
+        frontier = candidates[visible]
+        if not len(frontier):
+            break
+        tiles.append(frontier)
+    return np.concatenate(tiles)
+
+
+def tessellation_edges(matrices):
+    """
+    The edges of the tiles as (start, end) pairs of points in the upper half-plane
+    (end may be inf): the images of the bottom arc (rho to rho + 1) and of both sides
+    (rho and rho + 1 to inf). Neighboring tiles share edges, so the pairs are
+    deduplicated by hashing their rounded endpoints.
+    """
+    corners = (mobius(matrices, RHO), mobius(matrices, RHO + 1), mobius(matrices, np.inf))
+    starts = np.concatenate([corners[0], corners[1], corners[0]])
+    ends = np.concatenate([corners[1], corners[2], corners[2]])
+
+    swap = np.isfinite(ends) & ((starts.real > ends.real) | ((starts.real == ends.real) & (starts.imag > ends.imag)))
+    starts[swap], ends[swap] = ends[swap], starts[swap]
+    # Ends at infinity get a stand-in below the real axis, which no finite end can have.
+    finite_ends = np.where(np.isfinite(ends), ends, starts.real - 1j)
+    keys = np.round(np.column_stack([starts.real, starts.imag, finite_ends.real, finite_ends.imag]), 9)
+    _, first = np.unique(keys, axis=0, return_index=True)
+    return starts[first], ends[first]
+
+
+def geodesic_curves(starts, ends, top, segments=4):
+    """
+    Cubic Bezier control points, shape (n, segments, 4, 2), of the hyperbolic geodesics
+    from starts to ends: arcs of circles centered on the real axis, or vertical
+    segments. Ends at infinity are cut off at height `top`.
+    """
+    starts = np.asarray(starts, dtype=complex)
+    ends = np.asarray(ends, dtype=complex).copy()
+    infinite = ~np.isfinite(ends)
+    ends[infinite] = starts[infinite].real + 1j * np.maximum(top, starts[infinite].imag)
+    vertical = infinite | np.isclose(starts.real, ends.real, rtol=0, atol=1e-12)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        center = (np.abs(ends) ** 2 - np.abs(starts) ** 2) / (2 * (ends.real - starts.real))
+    center = np.where(vertical, 0.0, center)
+    radius = np.abs(starts - center)
+    angle_start = np.angle(starts - center)
+    angle_end = np.angle(ends - center)
+    # Split every arc into equal pieces; each piece gets the standard circle handles.
+    steps = np.linspace(0, 1, segments + 1)
+    angles = angle_start[:, None] + (angle_end - angle_start)[:, None] * steps[None, :]
+    piece = (angle_end - angle_start) / segments
+    handle = 4 / 3 * np.tan(piece / 4) * radius
+    points = center[:, None] + radius[:, None] * np.exp(1j * angles)
+    tangents = 1j * np.exp(1j * angles)
+    curves = np.stack([points[:, :-1], points[:, :-1] + (handle[:, None] * tangents[:, :-1]),
+                       points[:, 1:] - (handle[:, None] * tangents[:, 1:]), points[:, 1:]], axis=2)
+
+    # Vertical geodesics are straight segments, split the same way.
+    line = starts[vertical, None] + (ends - starts)[vertical, None] * steps[None, :]
+    thirds = np.array([0, 1 / 3, 2 / 3, 1])
+    curves[vertical] = line[:, :-1, None] + (line[:, 1:] - line[:, :-1])[:, :, None] * thirds[None, None, :]
+    return np.stack([curves.real, curves.imag], axis=-1)
+
+
+class ModularTessellation(VMobject):
+    """
+    The tessellation of the upper half-plane by the images of the fundamental domain
+    under SL2(Z), drawn on a ComplexPlane.
+
+    All geodesic edges are cubic subpaths of this one VMobject, so tens of thousands
+    of tiles cost one mobject rather than one per arc. Tiles outside the plane's
+    visible real range or lower than min_height (default: about a pixel) are skipped.
+    """
+
+    def __init__(self, plane, max_depth=12, min_height=None, stroke_width=1, **kwargs):
+        kwargs.setdefault("stroke_color", WHITE)
+        super().__init__(stroke_width=stroke_width, fill_opacity=0, **kwargs)
+        x_range, y_range = plane.x_range[:2], plane.y_range[:2]
+        if min_height is None:
+            min_height = (y_range[1] - y_range[0]) / config["pixel_height"]
+        self.matrices = modular_tiles(max_depth, x_range, min_height)
+        starts, ends = tessellation_edges(self.matrices)
+        curves = geodesic_curves(starts, ends, top=y_range[1])
+
+        origin = plane.c2p(0, 0)
+        unit_x = plane.c2p(1, 0) - origin
+        unit_y = plane.c2p(0, 1) - origin
+        self.points = (origin + curves[..., :1] * unit_x + curves[..., 1:] * unit_y).reshape(-1, 3)
+
+
+def benchmark(max_depth=24, min_height=0.002):
+    """
+    Time the generation of a large tessellation.
+    """
+    start = time.perf_counter()
+    matrices = modular_tiles(max_depth, min_height=min_height)
+    starts, ends = tessellation_edges(matrices)
+    curves = geodesic_curves(starts, ends, top=4)
+    elapsed = time.perf_counter() - start
+    print(f"{len(matrices)} tiles, {len(starts)} edges, {curves.shape[0] * curves.shape[1]} curves in {elapsed:.3f} s")
+
+
+if __name__ == "__main__":
+    benchmark(*(float(arg) if "." in arg else int(arg) for arg in sys.argv[1:]))
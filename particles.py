@@ -0,0 +1,101 @@
+from manim import *
+import numpy as np
+from voronoi_trajectory import bounce_step
+
+
+class ParticleSystem(VGroup):
+    """
+    Dots whose positions and velocities live in NumPy arrays.
+
+    advance() moves every particle in one vectorized step, and the rendered dots follow
+    in bulk: each dot's points are a view into one shared (n, points, 3) buffer, so a
+    single array addition moves them all. shift() (and so move_to() and friends) moves
+    the buffer and the positions together. Adding or removing dots, scaling or
+    rotating marks the buffer stale; animations interpolate the dots themselves and
+    replace their points, which is noticed because the dots no longer view the buffer.
+    Either way the buffer is re-bound on the next move. Points replaced on single dots
+    other than the first are not noticed.
+    """
+
+    def __init__(self, positions, velocities=None, bound=3.25, **dot_kwargs):
+        positions = np.array(positions, dtype=float)
+        super().__init__(*[Dot(np.append(p, 0), **dot_kwargs) for p in positions])
+        self.positions = positions
+        self.velocities = np.zeros_like(positions) if velocities is None else np.array(velocities, dtype=float)
+        self.bound = bound
+        self._bind()
+
+    def _bind(self):
+        """
+        Copy the dots' current points into the shared buffer and point the dots at it.
+        """
+        self._dirty = False
+        self.positions = np.array([dot.get_center()[:2] for dot in self.submobjects]).reshape(-1, 2)
+        lengths = {len(dot.points) for dot in self.submobjects}
+        if len(lengths) != 1:
+            # Mixed point counts cannot share a buffer; fall back to moving dots one by one.
+            self._buffer = None
+            return
+        self._buffer = np.array([dot.points for dot in self.submobjects], dtype=float)
+        for dot, view in zip(self.submobjects, self._buffer):
+            dot.points = view
+
+    def add(self, *mobjects):
+        self._dirty = True
+        return super().add(*mobjects)
+
+    def remove(self, *mobjects):
+        self._dirty = True
+        return super().remove(*mobjects)
+
+    def _stale(self):
+        """
+        Whether the buffer needs re-binding: it was marked dirty, or the dots' points
+        were replaced (checked on the first dot, since animations replace them all).
+        """
+        if self._dirty:
+            return True
+        if self._buffer is None or not len(self._buffer):
+            return False
+        return self.submobjects[0].points.base is not self._buffer
+
+    def apply_points_function_about_point(self, func, about_point=None, about_edge=None):
+        self._dirty = True
+        return super().apply_points_function_about_point(func, about_point, about_edge)
+
+    def shift(self, *vectors):
+        """
+        Shift all particles, keeping their positions in step.
+        """
+        total = np.sum([np.asarray(vector, dtype=float) for vector in vectors], axis=0)
+        if self._stale() or self._buffer is None:
+            super().shift(total)
+            self._dirty = True
+        else:
+            self._buffer += total
+        self.positions = self.positions + total[:2]
+        return self
+
+    def set_positions(self, positions):
+        """
+        Move all particles to new (n, 2) positions at once.
+        """
+        if self._stale():
+            self._bind()
+        positions = np.asarray(positions, dtype=float)
+        delta = positions - self.positions
+        if self._buffer is None:
+            for dot, d in zip(self.submobjects, delta):
+                dot.shift(np.append(d, 0))
+        else:
+            self._buffer[:, :, :2] += delta[:, None, :]
+        self.positions = positions.copy()
+        return self
+
+    def advance(self, dt):
+        """
+        Advance all particles by dt, bouncing off the walls of [-bound, bound]^2.
+        """
+        if self._stale():
+            self._bind()
+        return self.set_positions(bounce_step(self.positions, self.velocities, dt, self.bound))
@@ -0,0 +1,168 @@
+from manim import *
+import numpy as np
+
+
+def colors_to_rgbas(colors, count):
+    """
+    (count, 4) float RGBA array from one color, a list of one color per point, or an
+    (count, 3) / (count, 4) array of float RGB(A) rows.
+    """
+    if isinstance(colors, np.ndarray) and colors.ndim == 2:
+        rgbas = np.ones((len(colors), 4))
+        rgbas[:, :colors.shape[1]] = colors
+    elif isinstance(colors, (list, tuple)) and len(colors) == count and not isinstance(colors[0], (int, float)):
+        rgbas = np.array([color_to_rgba(color) for color in colors])
+    else:
+        rgbas = np.array([color_to_rgba(colors)])
+    return np.broadcast_to(rgbas, (count, 4)).astype(float)
+
+
+def rasterize_discs(positions, radii, pixels_per_unit, chunk_size=16384):
+    """
+    Anti-aliased coverage of a set of discs on a pixel grid covering their bounding box.
+
+    Returns (coverage, owner, top_left): coverage[row, col] in [0, 1] is how much the most
+    covering disc covers that pixel, owner[row, col] the index of that disc (-1 if none),
+    and top_left the scene coordinates of the grid's upper left corner. Discs are
+    splatted in chunks over a square window around each one, so no per-disc Python
+    work is done.
+    """
+    if len(positions) == 0:
+        return np.zeros((1, 1)), np.full((1, 1), -1), np.zeros(2)
+    radii_px = radii * pixels_per_unit
+    top_left = np.array([(positions[:, 0] - radii).min(), (positions[:, 1] + radii).max()])
+    bottom_right = np.array([(positions[:, 0] + radii).max(), (positions[:, 1] - radii).min()])
+    width = int(np.ceil((bottom_right[0] - top_left[0]) * pixels_per_unit)) + 2
+    height = int(np.ceil((top_left[1] - bottom_right[1]) * pixels_per_unit)) + 2
+    top_left = top_left - [1 / pixels_per_unit, -1 / pixels_per_unit]
+
+    coverage = np.zeros(height * width)
+    owner = np.full(height * width, -1)
+    col = (positions[:, 0] - top_left[0]) * pixels_per_unit
+    row = (top_left[1] - positions[:, 1]) * pixels_per_unit
+    window = int(np.ceil(radii_px.max())) + 1
+    steps = np.arange(-window, window + 1)
+
+    for start in range(0, len(positions), chunk_size):
+        part = slice(start, start + chunk_size)
+        cols = np.floor(col[part])[:, None, None].astype(int) + steps[None, None, :]
+        rows = np.floor(row[part])[:, None, None].astype(int) + steps[None, :, None]
+        dist = np.hypot(cols + 0.5 - col[part, None, None], rows + 0.5 - row[part, None, None])
+        cover = np.clip(radii_px[part, None, None] - dist + 0.5, 0, 1)
+        valid = (cover > 0) & (rows >= 0) & (rows < height) & (cols >= 0) & (cols < width)
+        pixel = (rows * width + cols)[valid]
+        cover = cover[valid]
+        disc = np.broadcast_to(np.arange(start, start + len(col[part]))[:, None, None], valid.shape)[valid]
+        np.maximum.at(coverage, pixel, cover)
+        wins = cover >= coverage[pixel]
+        owner[pixel[wins]] = disc[wins]
+
+    return coverage.reshape(height, width), owner.reshape(height, width), top_left
+
+
+class PointCloud(ImageMobject):
+    """
+    Many round points drawn as one mobject.
+
+    Positions, radii and per-point RGBA colors live in NumPy arrays and are rasterized
+    together into a single image at the render resolution, so 10^5 points cost one
+    image instead of 10^5 Bezier outlines. Being an image, the cloud fades in and out,
+    and transforming between two clouds with the same positions (e.g. through
+    .animate.set_point_colors()) cross-fades the colors of every point at once.
+    Moving or scaling the cloud moves its image; set_positions() re-rasterizes it.
+    pixels_per_unit defaults to the render resolution of an unzoomed camera.
+    """
+
+    def __init__(self, positions, radii=DEFAULT_DOT_RADIUS, colors=WHITE, pixels_per_unit=None, **kwargs):
+        positions = np.asarray(positions, dtype=float).reshape(-1, np.shape(positions)[-1])
+        self.resolution = pixels_per_unit
+        self.positions = positions[:, :2].copy()
+        self.radii = np.broadcast_to(np.asarray(radii, dtype=float), len(positions)).copy()
+        self.rgbas = colors_to_rgbas(colors, len(positions))
+        self.opacity = 1.0
+        self._rasterize()
+        super().__init__(self.pixel_array, scale_to_resolution=config["pixel_height"], **kwargs)
+        self._place()
+
+    def _rasterize(self):
+        self.pixels_per_unit = self.resolution or config["pixel_height"] / config["frame_height"]
+        self._coverage, self._owner, self._top_left = rasterize_discs(self.positions, self.radii, self.pixels_per_unit)
+        self.pixel_array = np.zeros(self._coverage.shape + (4,), dtype=np.uint8)
+        self._paint()
+
+    def _paint(self):
+        """
+        Fill the pixel array from the current colors and opacity.
+        """
+        covered = self._owner >= 0
+        rgbas = self.rgbas[self._owner[covered]]
+        self.pixel_array[covered, :3] = np.round(rgbas[:, :3] * 255)
+        self.pixel_array[..., 3] = 0
+        self.pixel_array[covered, 3] = np.round(self._coverage[covered] * rgbas[:, 3] * self.opacity * 255)
+
+    def _place(self):
+        """
+        Size and move the image so that its pixels line up with the points' positions.
+        """
+        height, width = self._coverage.shape
+        self.stretch_to_fit_height(height / self.pixels_per_unit)
+        self.stretch_to_fit_width(width / self.pixels_per_unit)
+        self.move_to(np.append(self._top_left + np.array([width, -height]) / (2 * self.pixels_per_unit), 0))
+
+    def set_positions(self, positions):
+        """
+        Move the points to new (n, 2) or (n, 3) positions and redraw them.
+        """
+        positions = np.asarray(positions, dtype=float)
+        self.positions = positions.reshape(-1, positions.shape[-1])[:, :2].copy()
+        self._rasterize()
+        self._place()
+        return self
+
+    def set_points(self, positions, radii, colors):
+        """
+        Replace the whole set of points (their number may change) and redraw them once.
+        """
+        positions = np.asarray(positions, dtype=float)
+        self.positions = positions.reshape(-1, positions.shape[-1])[:, :2].copy()
+        self.radii = np.broadcast_to(np.asarray(radii, dtype=float), len(self.positions)).copy()
+        self.rgbas = colors_to_rgbas(colors, len(self.positions))
+        self._rasterize()
+        self._place()
+        return self
+
+    def set_radii(self, radii):
+        self.radii = np.broadcast_to(np.asarray(radii, dtype=float), len(self.positions)).copy()
+        self._rasterize()
+        self._place()
+        return self
+
+    def set_point_colors(self, colors, indices=None):
+        """
+        Recolor all points, or only those at `indices`, from one color, a list of
+        colors or an array of RGB / RGBA rows.
+        """
+        if indices is None:
+            self.rgbas = colors_to_rgbas(colors, len(self.positions))
+        else:
+            indices = np.asarray(indices)
+            self.rgbas[indices] = colors_to_rgbas(colors, len(self.rgbas[indices]))
+        self._paint()
+        return self
+
+    def set_color(self, color, alpha=None, family=True):
+        self.set_point_colors(color)
+        if alpha is not None:
+            self.set_opacity(alpha)
+        self.color = color
+        return self
+
+    def set_opacity(self, alpha):
+        """
+        Opacity of the whole cloud; per-point alpha from the colors is kept.
+        """
+        self.opacity = alpha
+        self.fill_opacity = alpha
+        self.stroke_opacity = alpha
+        self._paint()
+        return self
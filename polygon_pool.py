@@ -0,0 +1,66 @@
+from manim import *
+import numpy as np
+
+
+class PolygonPool(VGroup):
+    """
+    A fixed set of preallocated polygon slots whose points are rewritten in place.
+
+    Every slot owns a row of one shared buffer with room for max_vertices corners; a
+    polygon with fewer corners repeats its first vertex as zero-length closing curves, so
+    the point arrays never change shape. Slots without a cell are hidden by giving them
+    an empty view of their row, which keeps them out of the renderer without freeing it.
+    """
+
+    def __init__(self, size, max_vertices=16, **kwargs):
+        super().__init__(*[VMobject(**kwargs) for _ in range(size)])
+        self.size = size
+        self.num_visible = 0
+        self._allocate(max_vertices)
+
+    def _allocate(self, max_vertices):
+        self.max_vertices = max_vertices
+        nppcc = self.submobjects[0].n_points_per_cubic_curve if self.submobjects else 4
+        self._buffer = np.zeros((self.size, nppcc * max_vertices, 3))
+        self._corners = np.empty((2, self.size, max_vertices, 2))
+        self._shown = [self._buffer[i] for i in range(self.size)]
+        self._hidden = [self._buffer[i, :0] for i in range(self.size)]
+        for slot, hidden in zip(self.submobjects, self._hidden):
+            slot.points = hidden
+        self.num_visible = 0
+
+    def set_cells(self, cells):
+        """
+        Show the cells of a CellSet in the first len(cells) slots and hide the rest.
+        """
+        count = min(len(cells), self.size)
+        sizes = cells.sizes[:count]
+        if count and sizes.max() > self.max_vertices:
+            self._allocate(max(int(sizes.max()), 2 * self.max_vertices))
+
+        # Corner k of every cell goes to column k; unused columns repeat the first corner.
+        offsets = cells.offsets[:count + 1]
+        coords = cells.vertices[cells.indices[:offsets[-1]]]
+        owner = np.repeat(np.arange(count), sizes)
+        local = np.arange(len(owner)) - offsets[owner]
+        following = offsets[owner] + (local + 1) % sizes[owner]
+        starts, ends = self._corners[:, :count]
+        starts[...] = coords[offsets[:-1]][:, None, :]
+        ends[...] = starts
+        starts[owner, local] = coords
+        ends[owner, local] = coords[following]
+
+        # Straight Bezier segments: anchors and handles evenly spaced along each edge.
+        curves = self._buffer[:count].reshape(count, self.max_vertices, -1, 3)
+        t = np.linspace(0, 1, curves.shape[2])[None, None, :, None]
+        curves[..., :2] = starts[:, :, None, :] + t * (ends - starts)[:, :, None, :]
+
+        # Only slots whose visibility changed (or whose points were replaced) are touched.
+        for i in range(count):
+            if self.submobjects[i].points is not self._shown[i]:
+                self.submobjects[i].points = self._shown[i]
+        for i in range(count, self.size):
+            if self.submobjects[i].points is not self._hidden[i]:
+                self.submobjects[i].points = self._hidden[i]
+        self.num_visible = count
+        return self
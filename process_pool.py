@@ -0,0 +1,17 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def process_map(function, *iterables, processes=None):
+    """
+    list(map(function, *iterables)), computed in a pool of worker processes (by default
+    one per CPU, never more than there are calls). With a single worker the calls run
+    in this process instead, without starting a pool. As with map(), the shortest
+    iterable decides the number of calls, so constant arguments can be itertools.repeat.
+    """
+    calls = list(zip(*iterables))
+    workers = min(len(calls), processes or os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(function, *zip(*calls)))
+    return [function(*arguments) for arguments in calls]
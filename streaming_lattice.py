@@ -0,0 +1,66 @@
+from manim import *
+import numpy as np
+from instanced_shape import InstancedShape
+from point_cloud import PointCloud
+
+
+class StreamingLattice(Group):
+    """
+    The part of a lattice that a camera frame can see.
+
+    Only lattice points inside the frame plus a margin are materialized: dots as one
+    PointCloud, and optionally a circle ("sphere") around every point, all instances
+    of one InstancedShape. An updater follows the frame. While the frame stays inside
+    the materialized box nothing is done; once it pans out of the box or zooms in or
+    out far enough, the box is recomputed around the frame and all of its dots and
+    circles are rebuilt, in one vectorized pass each. Nothing is kept from the old box.
+    """
+
+    def __init__(self, lattice, frame, margin=1.0, dot_radius=0.08, dot_color=BLUE, **kwargs):
+        self.lattice = lattice
+        self.frame = frame
+        self.margin = margin
+        self.dot_radius = dot_radius
+        self.dot_color = dot_color
+        self.dots = PointCloud(np.zeros((0, 2)), radii=dot_radius, colors=dot_color)
+        self.spheres = None
+        self._box = None
+        super().__init__(self.dots, **kwargs)
+        self.update_view(force=True)
+        self.add_updater(lambda mob: mob.update_view())
+
+    def _view_box(self):
+        center = self.frame.get_center()[:2]
+        half = np.array([self.frame.width, self.frame.height]) / 2
+        return center - half, center + half
+
+    def update_view(self, force=False):
+        """
+        Rebuild the box around the frame, with all its dots and circles, if the frame
+        left the current box or was zoomed in or out (or if force is set).
+        """
+        lower, upper = self._view_box()
+        if not force and self._box is not None:
+            box_lower, box_upper = self._box
+            inside = np.all(lower >= box_lower) and np.all(upper <= box_upper)
+            zoomed_in = (upper - lower)[0] < (box_upper - box_lower)[0] / 2
+            if inside and not zoomed_in:
+                return self
+
+        margin = self.margin * self.frame.width / config["frame_width"]
+        self._box = (lower - margin, upper + margin)
+        points = self.lattice.points_in_box(*self._box)
+        self.dots.resolution = config["pixel_height"] / self.frame.height
+        self.dots.set_points(points, self.dot_radius, self.dot_color)
+        if self.spheres is not None:
+            self.spheres.set_instances(points)
+        return self
+
+    def show_spheres(self, radius, **circle_kwargs):
+        """
+        Start drawing a circle of the given radius around every materialized point.
+        Returns the circles as an InstancedShape, e.g. to animate with CreateInstances.
+        """
+        self.spheres = InstancedShape(Circle(radius=radius), self.dots.positions, **circle_kwargs)
+        self.add(self.spheres)
+        return self.spheres
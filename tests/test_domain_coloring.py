@@ -0,0 +1,31 @@
+import sys
+import os
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+manim = pytest.importorskip("manim")
+
+from domain_coloring import DomainColoring
+
+
+def identity(z):
+    return z
+
+
+def test_set_opacity_keeps_lower_half_plane_transparent(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # the tile cache lives under the working directory
+    plane = manim.ComplexPlane(x_range=[-2, 2], y_range=[-1, 1])
+    coloring = DomainColoring(plane, identity, pixel_width=32, processes=1)
+    alpha = coloring.pixel_array[:, :, 3]
+    lower = alpha == 0
+    assert lower.any() and not lower.all()
+
+    coloring.set_opacity(0.8)
+    assert np.all(alpha[lower] == 0)
+    assert np.all(alpha[~lower] == 204)
+
+    # Opacity scales the rendered alpha, so it can be raised again.
+    coloring.set_opacity(0).set_opacity(1)
+    assert np.all(alpha[lower] == 0)
+    assert np.all(alpha[~lower] == 255)
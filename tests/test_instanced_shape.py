@@ -0,0 +1,33 @@
+import sys
+import os
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+manim = pytest.importorskip("manim")
+
+from instanced_shape import CreateInstances, InstancedShape
+
+
+def test_create_instances_keeps_lag_ratio():
+    shape = InstancedShape(manim.Circle(radius=0.1), np.arange(10)[:, None] * [1.0, 0.0])
+    animation = CreateInstances(shape, lag_ratio=0.2, rate_func=manim.linear)
+    assert animation.lag_ratio == 0.2
+    assert animation.run_time == pytest.approx(1 + 9 * 0.2)
+
+    animation.begin()
+    # Halfway through (1.4 of 2.8 time units), instance 0 is done, instance 5 has
+    # just started drawing (1.4 - 5 * 0.2 = 0.4) and instance 9 has not started.
+    animation.interpolate_mobject(0.5)
+    assert shape.progress[0] == pytest.approx(1)
+    assert shape.progress[5] == pytest.approx(0.4)
+    assert shape.progress[9] == pytest.approx(0)
+
+
+def test_create_instances_applies_rate_func_per_instance():
+    shape = InstancedShape(manim.Circle(radius=0.1), np.arange(10)[:, None] * [1.0, 0.0])
+    animation = CreateInstances(shape, lag_ratio=0.2, rate_func=manim.smooth)
+    animation.begin()
+    animation.interpolate_mobject(0.5)
+    assert shape.progress[5] == pytest.approx(manim.smooth(0.4), abs=1e-5)
+    assert shape.progress[0] == pytest.approx(1)
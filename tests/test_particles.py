@@ -0,0 +1,67 @@
+import sys
+import os
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+manim = pytest.importorskip("manim")
+
+from particles import ParticleSystem
+
+
+def centers(system):
+    return np.array([dot.get_center()[:2] for dot in system.submobjects])
+
+
+def test_advance_moves_dots_with_positions():
+    system = ParticleSystem([[0.0, 0.0], [1.0, 0.0]], velocities=[[1.0, 0.0], [0.0, 1.0]])
+    system.advance(0.5)
+    assert np.allclose(system.positions, [[0.5, 0.0], [1.0, 0.5]])
+    assert np.allclose(centers(system), system.positions)
+
+
+def test_shift_and_move_to_keep_positions():
+    system = ParticleSystem([[0.0, 0.0], [1.0, 0.0]], velocities=[[1.0, 0.0], [1.0, 0.0]])
+    system.shift(manim.UP)
+    assert np.allclose(system.positions, [[0.0, 1.0], [1.0, 1.0]])
+    system.move_to(manim.ORIGIN)
+    assert np.allclose(system.positions, [[-0.5, 0.0], [0.5, 0.0]])
+
+    # advance() continues from where the dots were moved to instead of snapping back.
+    system.advance(0.25)
+    assert np.allclose(system.positions, [[-0.25, 0.0], [0.75, 0.0]])
+    assert np.allclose(centers(system), system.positions)
+
+
+def test_added_dots_are_bound_on_the_next_move():
+    system = ParticleSystem([[0.0, 0.0]])
+    system.add(manim.Dot([2.0, 0.0, 0.0]))
+    system.set_positions([[0.0, 1.0], [2.0, 1.0]])
+    assert np.allclose(centers(system), [[0.0, 1.0], [2.0, 1.0]])
+
+
+def play(animation):
+    """
+    Run an animation's frames the way Scene.play does, without a scene to render them.
+    """
+    animation.begin()
+    for alpha in np.linspace(0, 1, 5):
+        animation.interpolate(alpha)
+    animation.finish()
+
+
+def test_advance_after_animate_moves_the_dots():
+    system = ParticleSystem([[0.0, 0.0], [1.0, 0.0]], velocities=[[1.0, 0.0], [1.0, 0.0]])
+    play(system.animate.shift(manim.UP).build())
+    for _ in range(3):
+        system.advance(0.5)
+    assert np.allclose(system.positions, [[1.5, 1.0], [2.5, 1.0]])
+    assert np.allclose(centers(system), system.positions)
+
+
+def test_advance_after_fade_in_moves_the_dots():
+    system = ParticleSystem([[0.0, 0.0], [1.0, 0.0]], velocities=[[1.0, 0.0], [1.0, 0.0]])
+    play(manim.FadeIn(system))
+    system.advance(0.5)
+    assert np.allclose(system.positions, [[0.5, 0.0], [1.5, 0.0]])
+    assert np.allclose(centers(system), system.positions)
@@ -0,0 +1,210 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+class CellSet:
+    """
+    A set of polygons stored CSR-style: cell i is vertices[indices[offsets[i]:offsets[i + 1]]].
+    ids[i] is the generator (or source cell) that cell i belongs to.
+    """
+
+    def __init__(self, vertices, indices, offsets, ids=None):
+        self.vertices = np.asarray(vertices, dtype=float)
+        self.indices = np.asarray(indices, dtype=np.intp)
+        self.offsets = np.asarray(offsets, dtype=np.intp)
+        self.ids = np.arange(len(self.offsets) - 1) if ids is None else np.asarray(ids, dtype=np.intp)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.cell(i)
+
+    @property
+    def sizes(self):
+        return np.diff(self.offsets)
+
+    @property
+    def owners(self):
+        """
+        Position of the cell each entry of self.indices belongs to.
+        """
+        return np.repeat(np.arange(len(self)), self.sizes)
+
+    def cell(self, i):
+        """
+        Vertex coordinates of cell i, in counterclockwise order.
+        """
+        return self.vertices[self.indices[self.offsets[i]:self.offsets[i + 1]]]
+
+    def regions(self):
+        """
+        Cells as lists of indices into self.vertices.
+        """
+        return [region.tolist() for region in np.split(self.indices, self.offsets[1:-1])]
+
+
+def sort_cells_ccw(vertices, owner, vertex_ids, num_cells):
+    """
+    Group (owner, vertex) pairs into a CellSet, each cell ordered counterclockwise
+    around the mean of its vertices.
+    """
+    counts = np.bincount(owner, minlength=num_cells)
+    safe = np.maximum(counts, 1)
+    cx = np.bincount(owner, weights=vertices[vertex_ids, 0], minlength=num_cells) / safe
+    cy = np.bincount(owner, weights=vertices[vertex_ids, 1], minlength=num_cells) / safe
+    angles = np.arctan2(vertices[vertex_ids, 1] - cy[owner], vertices[vertex_ids, 0] - cx[owner])
+    order = np.lexsort((angles, owner))
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    return CellSet(vertices, vertex_ids[order], offsets)
+
+
+def finite_voronoi_cells(vor, radius=None):
+    """
+    Reconstruct infinite Voronoi regions in a 2D diagram to finite regions.
+
+    Every infinite ridge is cut off at a far point `radius` away from its finite vertex.
+    Returns a CellSet whose cell i belongs to vor.points[i].
+    """
+    if vor.points.shape[1] != 2:
+        raise ValueError("Requires 2D input")
+    points = vor.points
+    center = points.mean(axis=0)
+    if radius is None:
+        radius = np.ptp(points) * 2
+
+    ridge_points = np.asarray(vor.ridge_points, dtype=np.intp)
+    ridge_vertices = np.asarray(vor.ridge_vertices, dtype=np.intp)
+    infinite = np.nonzero((ridge_vertices < 0).any(axis=1))[0]
+
+    # Compute the missing endpoint of every infinite ridge at once.
+    p1, p2 = ridge_points[infinite, 0], ridge_points[infinite, 1]
+    tangent = points[p2] - points[p1]
+    tangent /= np.linalg.norm(tangent, axis=1, keepdims=True)
+    normal = np.column_stack([-tangent[:, 1], tangent[:, 0]])
+    midpoint = (points[p1] + points[p2]) / 2
+    side = np.sign(((midpoint - center) * normal).sum(axis=1))
+    finite_end = ridge_vertices[infinite].max(axis=1)
+    far_points = vor.vertices[finite_end] + side[:, None] * normal * radius
+
+    vertices = np.vstack([vor.vertices, far_points])
+    ends = ridge_vertices.copy()
+    ends[infinite] = np.column_stack([finite_end, len(vor.vertices) + np.arange(len(infinite))])
+
+    # Both generators of a ridge own both of its endpoints.
+    owner = np.repeat(ridge_points, 2, axis=1).ravel()
+    vertex_ids = np.tile(ends, 2).ravel()
+    key = np.unique(owner * len(vertices) + vertex_ids)
+    return sort_cells_ccw(vertices, key // len(vertices), key % len(vertices), len(points))
+
+
+def _window_edges(window):
+    """
+    Counterclockwise corners of a clip window given as (x_min, y_min, x_max, y_max)
+    or as the vertices of a convex polygon.
+    """
+    window = np.asarray(window, dtype=float)
+    if window.shape == (4,):
+        x_min, y_min, x_max, y_max = window
+        return np.array([[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]])
+    area = np.sum(window[:, 0] * np.roll(window[:, 1], -1) - np.roll(window[:, 0], -1) * window[:, 1])
+    return window if area > 0 else window[::-1]
+
+
+def _next_in_cell(owner, offsets):
+    """
+    Index of the following vertex of the same cell, wrapping around at the end of each cell.
+    """
+    nxt = np.arange(1, len(owner) + 1)
+    nonempty = offsets[1:] > offsets[:-1]
+    nxt[offsets[1:][nonempty] - 1] = offsets[:-1][nonempty]
+    return nxt
+
+
+def clip_cells(cells, window, drop_empty=True):
+    """
+    Clip convex cells against a convex window, all cells at once.
+
+    Runs Sutherland-Hodgman on the flat vertex arrays, one window edge at a time.
+    Cells that end up empty (or degenerate to a segment) are dropped unless
+    drop_empty is False, in which case they are kept with no vertices.
+    """
+    corners = _window_edges(window)
+    num_cells = len(cells)
+    coords = cells.vertices[cells.indices]
+    owner = cells.owners
+    offsets = cells.offsets
+
+    for a, b in zip(corners, np.roll(corners, -1, axis=0)):
+        edge = b - a
+        side = edge[0] * (coords[:, 1] - a[1]) - edge[1] * (coords[:, 0] - a[0])
+        nxt = _next_in_cell(owner, offsets)
+        inside = side >= 0
+        crossing = inside != inside[nxt]
+        t = np.where(crossing, side / np.where(crossing, side - side[nxt], 1), 0)
+        crossing_point = coords + t[:, None] * (coords[nxt] - coords)
+
+        # Every edge emits its start vertex if inside, then the crossing point if any.
+        emitted = np.stack([coords, crossing_point], axis=1)
+        mask = np.column_stack([inside, crossing])
+        coords = emitted[mask]
+        owner = np.repeat(owner, mask.sum(axis=1))
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(owner, minlength=num_cells))])
+
+    # Drop repeated vertices produced by cells touching a window edge.
+    if len(coords):
+        nxt = _next_in_cell(owner, offsets)
+        distinct = np.abs(coords[nxt] - coords).max(axis=1) > 1e-12
+        coords, owner = coords[distinct], owner[distinct]
+
+    nxt = _next_in_cell(owner, np.concatenate([[0], np.cumsum(np.bincount(owner, minlength=num_cells))]))
+    cross = coords[:, 0] * coords[nxt, 1] - coords[nxt, 0] * coords[:, 1]
+    area = np.bincount(owner, weights=cross, minlength=num_cells) / 2
+    counts = np.bincount(owner, minlength=num_cells)
+    solid = (counts >= 3) & (area > 1e-12)
+
+    keep_vertex = solid[owner]
+    coords, owner = coords[keep_vertex], owner[keep_vertex]
+    ids = cells.ids
+    if drop_empty:
+        ids = ids[solid]
+        owner = np.cumsum(solid)[owner] - 1
+        num_cells = len(ids)
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(owner, minlength=num_cells))])
+    return CellSet(coords, np.arange(len(coords)), offsets, ids)
+
+
+class CellLocator:
+    """
+    Batched point location in a Voronoi diagram.
+
+    A point lies in the cell of its nearest generator, so a KD-tree over the generators
+    answers "which cell" for many query points at once without any polygon tests.
+    """
+
+    def __init__(self, generators, window=None):
+        self.generators = np.asarray(generators, dtype=float)
+        self.tree = cKDTree(self.generators)
+        self.window = None if window is None else _window_edges(window)
+
+    def nearest(self, queries, k=1):
+        """
+        Distances to and indices of the k nearest generators of every query point.
+        """
+        return self.tree.query(np.asarray(queries, dtype=float)[..., :2], k=k)
+
+    def locate(self, queries):
+        """
+        Generator index of the cell containing every query point, or -1 for points
+        outside the clip window.
+        """
+        queries = np.asarray(queries, dtype=float)[..., :2]
+        _, cells = self.tree.query(queries)
+        if self.window is not None:
+            corners = self.window
+            edge = np.roll(corners, -1, axis=0) - corners
+            rel = queries[..., None, :] - corners
+            inside = (edge[:, 0] * rel[..., 1] - edge[:, 1] * rel[..., 0] >= 0).all(axis=-1)
+            cells = np.where(inside, cells, -1)
+        return cells
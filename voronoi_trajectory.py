@@ -0,0 +1,135 @@
+import os
+import shutil
+from itertools import repeat
+import numpy as np
+from scipy.spatial import Voronoi
+from disk_cache import cache_key, cache_path
+from process_pool import process_map
+from voronoi_geometry import CellSet, clip_cells, finite_voronoi_cells
+
+# Bump when the layout of the cached files changes.
+TRAJECTORY_FORMAT = 1
+
+
+def bounce_step(positions, velocities, dt, bound):
+    """
+    Advance points by one step inside the square [-bound, bound]^2.
+    Velocity components are reversed when a point leaves the square (in place), and the
+    point is clamped back onto the wall, exactly like MovingVoronoi's per-dot updaters.
+    """
+    positions = positions + velocities * dt
+    velocities[np.abs(positions) > bound] *= -1
+    return np.clip(positions, -bound, bound)
+
+
+def simulate_bounce(points, velocities, duration, dt, bound):
+    """
+    Positions of bouncing points at every step of a fixed-timestep simulation,
+    shape (num_steps + 1, num_points, 2) with the starting positions first.
+    """
+    num_steps = int(round(duration / dt))
+    positions = np.empty((num_steps + 1,) + np.shape(points))
+    positions[0] = points
+    velocities = np.array(velocities, dtype=float)
+    for step in range(num_steps):
+        positions[step + 1] = bounce_step(positions[step], velocities, dt, bound)
+    return positions
+
+
+def _trajectory_chunk(positions, window, radius):
+    """
+    Clipped Voronoi cells for a run of frames, concatenated CSR-style (worker process).
+    """
+    vertices, sizes, ids, cells_per_frame = [], [], [], []
+    for points in positions:
+        cells = clip_cells(finite_voronoi_cells(Voronoi(points), radius=radius), window)
+        vertices.append(cells.vertices[cells.indices])
+        sizes.append(cells.sizes)
+        ids.append(cells.ids)
+        cells_per_frame.append(len(cells))
+    return np.concatenate(vertices), np.concatenate(sizes), np.concatenate(ids), np.array(cells_per_frame)
+
+
+class VoronoiTrajectory:
+    """
+    Positions and clipped Voronoi cells of every simulation step, memory-mapped from disk.
+
+    Cells of all frames share one CSR layout: frame f owns cells
+    frame_offsets[f]:frame_offsets[f + 1], and cell c owns vertices
+    cell_offsets[c]:cell_offsets[c + 1].
+    """
+
+    FILES = ("positions", "vertices", "cell_offsets", "frame_offsets", "ids")
+
+    def __init__(self, directory, dt):
+        self.directory = directory
+        self.dt = dt
+        for name in self.FILES:
+            setattr(self, name, np.load(os.path.join(directory, name + ".npy"), mmap_mode="r"))
+
+    def __len__(self):
+        return len(self.positions)
+
+    def frame_at(self, time):
+        """
+        Index of the simulation step closest to a time in seconds.
+        """
+        return min(int(round(time / self.dt)), len(self) - 1)
+
+    def positions_at(self, frame):
+        return np.asarray(self.positions[frame])
+
+    def cells_at(self, frame):
+        """
+        Clipped cells of a frame as a CellSet.
+        """
+        first, last = self.frame_offsets[frame], self.frame_offsets[frame + 1]
+        offsets = np.asarray(self.cell_offsets[first:last + 1])
+        vertices = np.asarray(self.vertices[offsets[0]:offsets[-1]])
+        return CellSet(vertices, np.arange(len(vertices)), offsets - offsets[0], self.ids[first:last])
+
+
+def precompute_voronoi_trajectory(points, velocities, duration, window, dt=1 / 120, bound=3.25,
+                                  radius=8, processes=None):
+    """
+    Simulate bouncing generators with a fixed timestep and store every frame's clipped
+    Voronoi cells on disk, computing the frames in a process pool.
+
+    The cache is keyed by the starting state and simulation parameters only, so renders
+    at any quality or frame rate reuse the same files and do no geometry work.
+    """
+    points = np.asarray(points, dtype=float)
+    velocities = np.asarray(velocities, dtype=float)
+    window = tuple(np.asarray(window, dtype=float).ravel().tolist())
+    key = cache_key(TRAJECTORY_FORMAT, points, velocities, duration, dt, bound, window, radius)
+    directory = cache_path("voronoi_trajectory", key)
+    if os.path.exists(os.path.join(directory, "ids.npy")):
+        return VoronoiTrajectory(directory, dt)
+
+    positions = simulate_bounce(points, velocities, duration, dt, bound)
+    # A few chunks per worker balance the load; a single worker computes one chunk in-process.
+    workers = processes or os.cpu_count() or 1
+    chunks = np.array_split(positions, min(len(positions), 4 * workers if workers > 1 else 1))
+    results = process_map(_trajectory_chunk, chunks, repeat(window), repeat(radius), processes=processes)
+
+    # Write everything into a scratch directory first so a crash never leaves half a cache.
+    scratch = f"{directory}.tmp{os.getpid()}"
+    os.makedirs(scratch, exist_ok=True)
+    vertices, sizes, ids, cells_per_frame = (np.concatenate(part) for part in zip(*results))
+    arrays = {
+        "positions": positions,
+        "vertices": vertices,
+        "cell_offsets": np.concatenate([[0], np.cumsum(sizes)]),
+        "frame_offsets": np.concatenate([[0], np.cumsum(cells_per_frame)]),
+        "ids": ids,
+    }
+    for name in VoronoiTrajectory.FILES:
+        stored = np.lib.format.open_memmap(os.path.join(scratch, name + ".npy"), mode="w+",
+                                           dtype=arrays[name].dtype, shape=arrays[name].shape)
+        stored[...] = arrays[name]
+        stored.flush()
+        del stored
+    if os.path.exists(directory):
+        shutil.rmtree(directory)
+    os.replace(scratch, directory)
+    return VoronoiTrajectory(directory, dt)